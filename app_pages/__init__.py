@@ -0,0 +1,21 @@
+# Pages of the Streamlit app. Every page lives in its own module, which is
+# imported on the first render of that page, so a page only pays for the
+# libraries it uses (the Introduction and Methodology pages only need
+# Streamlit). Keep this package module free of heavy imports: it is loaded by
+# the main script on every cold start.
+
+# Sidebar page name -> module with a render(session_state) function
+PAGE_MODULES = {
+    "Introduction": "app_pages.introduction",
+    "Insurance Activities": "app_pages.insurance",
+    "Investment Activities": "app_pages.investment",
+    "Scenario Analysis": "app_pages.scenario_analysis",
+    "Sensitivity Analysis": "app_pages.sensitivity",
+    "Group Consolidation": "app_pages.group",
+    "Assessment History": "app_pages.history",
+    "Methodology": "app_pages.methodology",
+}
+
+# Heatmap rendering modes; the first is the default. Static PNG stays the
+# default, with the interactive chart as the alternative
+HEATMAP_MODES = ["Static (PNG)", "Interactive"]
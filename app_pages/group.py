@@ -0,0 +1,110 @@
+import time
+
+import streamlit as st
+
+from batch_assessment import read_exposures
+from group_consolidation import GroupConsolidation
+from materiality_engine import encode_exposure
+from profiling import timed
+from app_pages.shared import INSURANCE_EXPOSURE_OPTIONS, show_heatmap
+
+# Group Consolidation page: section 6.
+
+
+def store_group(session_state, group):
+    # The consolidation is kept in the session store, which rejects values
+    # above its per-session cap; returns False after showing an error then
+    try:
+        session_state["group_consolidation"] = group
+    except ValueError as exc:
+        st.error(f"The group consolidation is too large to keep in this session: {exc}. "
+                 "Split the subsidiary file or raise ESG_SESSION_MAX_BYTES.")
+        return False
+    return True
+
+
+def section_6_group_consolidation(session_state):
+    # Section 6: group-level assessment consolidated from many subsidiaries
+    st.header("6. Group Consolidation")
+    st.write("Upload the exposures of the group's subsidiaries to assess the group as a whole. The file has one row per subsidiary and line of business or asset class with Entity, Line and Exposure columns, as for the batch assessment, and an optional Volume column with the net premium or market value (required on every row when present). Group results are the volume-weighted averages over the subsidiaries for which a line is relevant (equally weighted without volumes).")
+
+    uploaded = st.file_uploader("Subsidiary exposures", type=["csv"], help="Entity, Line, Exposure and optional Volume columns")
+    if uploaded is None:
+        return
+    # Re-read the file as well if the session store evicted the consolidation
+    group = session_state.get_value("group_consolidation")
+    if group is None or session_state.get_value("group_file_id") != uploaded.file_id:
+        try:
+            uploaded.seek(0)
+            with timed("Group: consolidation"):
+                group = GroupConsolidation.from_exposures(read_exposures(uploaded))
+        except ValueError as exc:
+            st.error(f"Could not read the exposure file: {exc}")
+            return
+        if not store_group(session_state, group):
+            return
+        session_state["group_file_id"] = uploaded.file_id
+    st.caption(f"{len(group.entities):,} subsidiaries, {'volume-weighted' if group.weighted else 'equally weighted'}")
+
+    activity = st.radio("Activity", ["Insurance", "Investment"], horizontal=True, key="group_activity")
+    results = group.group_results(activity)
+
+    st.write(f"### Group {activity} Heatmap and Results")
+    explanations = [f"{count} subsidiaries. {text}" for count, text in zip(results['Entities'], results['Explanation'])]
+    show_heatmap(results['Short Name'], results['Physical Risk Result'], results['Transitional Risk Result'],
+                 results['Exposure Materiality'], explanations, f"Group {activity} Heatmap", "Group: heatmap rendering")
+    st.write(results)
+
+    st.write("### Drill-down by line")
+    line = st.selectbox("Line of business / asset class", results['Line'])
+    st.write(group.line_contributions(line))
+
+    st.write("### Drill-down by subsidiary")
+    entity = st.selectbox("Subsidiary", group.entities)
+    entity_results = group.entity_results(entity)
+    rows = (entity_results['Activity'] == activity).to_numpy()
+    entity_results = entity_results[rows].reset_index(drop=True)
+    show_heatmap(entity_results['Short Name'], entity_results['Physical Risk Result'], entity_results['Transitional Risk Result'],
+                 entity_results['Exposure Materiality'], entity_results['Explanation'], f"{entity} - {activity} Heatmap",
+                 "Group: subsidiary heatmap rendering")
+
+    # Editing a subsidiary only updates its contribution to the group sums
+    with st.form("group_entity_form"):
+        grid = entity_results[['Line', 'Exposure Materiality'] + (['Volume'] if group.weighted else [])]
+        edited_grid = st.data_editor(
+            grid,
+            column_config={
+                "Exposure Materiality": st.column_config.SelectboxColumn(options=INSURANCE_EXPOSURE_OPTIONS, required=True),
+                "Volume": st.column_config.NumberColumn(min_value=0.0),
+            },
+            disabled=["Line"],
+            hide_index=True,
+            key=f"group_entity_grid_{uploaded.file_id}_{entity}_{activity}",
+            width="stretch",
+        )
+        submitted = st.form_submit_button("Update subsidiary")
+    if submitted:
+        row = group.entities.index(entity)
+        codes = group.codes[row].copy()
+        codes[rows] = encode_exposure(edited_grid['Exposure Materiality'])
+        volumes = None
+        if group.weighted:
+            volumes = group.volumes[row].copy()
+            volumes[rows] = edited_grid['Volume'].fillna(0.0).to_numpy()
+        start = time.perf_counter()
+        group.update_entity(entity, codes, volumes)
+        elapsed = time.perf_counter() - start
+        if not store_group(session_state, group):
+            return
+        # Rerun so the group heatmap and tables above show the update
+        session_state["group_update_message"] = f"{entity} updated; group re-aggregated in {elapsed * 1000:.2f} ms."
+        st.rerun()
+
+    message = session_state.get_value("group_update_message")
+    if message:
+        st.success(message)
+        session_state["group_update_message"] = None
+
+
+def render(session_state):
+    section_6_group_consolidation(session_state)
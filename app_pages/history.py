@@ -0,0 +1,71 @@
+import streamlit as st
+
+from assessment_history import assessment_history
+from profiling import timed
+from reference_data import asset_factor_table, lob_factor_table
+
+# Assessment History page: section 5.
+
+
+def section_5_assessment_history(session_state):
+    # Section 5: assessments saved to the local history, loading a past
+    # assessment into the questionnaires and comparing two runs
+    st.header("5. Assessment History")
+    st.write("Assessments saved on the Insurance Activities and Investment Activities pages, with their inputs, risk-factor versions and results. Load a past assessment into its questionnaire or compare two runs, e.g. this year's ORSA assessment with last year's.")
+
+    filters = st.columns(5)
+    entity = filters[0].selectbox("Entity", ["All"] + assessment_history.entities())
+    activity = filters[1].selectbox("Activity", ["All", "Insurance", "Investment"])
+    line = filters[2].selectbox("Line of business / asset class", ["All"] + list(lob_factor_table().names) + list(asset_factor_table().names))
+    since = filters[3].date_input("From", value=None)
+    until = filters[4].date_input("Until", value=None)
+
+    def selected(value):
+        return None if value == "All" else value
+
+    with timed("History: query"):
+        runs = assessment_history.assessments(entity=selected(entity), activity=selected(activity), line=selected(line),
+                                              since=since and since.isoformat(), until=until and until.isoformat())
+    if runs.empty:
+        st.info("No saved assessments match the filters.")
+        return
+    st.dataframe(runs, hide_index=True)
+
+    labels = {row.ID: f"#{row.ID} {row.Entity} - {row.Activity} - {row.Created}" for row in runs.itertuples()}
+    ids = list(labels)
+
+    st.write("### Load an assessment")
+    with st.form("load_assessment_form"):
+        load_id = st.selectbox("Assessment", ids, format_func=labels.get)
+        submitted = st.form_submit_button("Load into questionnaire")
+    if submitted:
+        with timed("History: load"):
+            stored = assessment_history.load(load_id)
+        session_state[f"loaded_{stored.activity.lower()}_assessment"] = stored
+        st.success(f"Assessment #{stored.id} loaded. Open the {stored.activity} Activities page to review or update it.")
+        st.write(stored.lines)
+
+    if len(ids) > 1:
+        st.write("### Compare two assessments")
+        columns = st.columns(2)
+        old_id = columns[0].selectbox("Earlier assessment", ids, index=1, format_func=labels.get)
+        new_id = columns[1].selectbox("Later assessment", ids, index=0, format_func=labels.get)
+        with timed("History: diff"):
+            diff = assessment_history.diff(old_id, new_id)
+        versions = runs.set_index("ID")["Factor Version"]
+        if versions[old_id] != versions[new_id]:
+            st.caption(f"Risk factors changed between the runs: {versions[old_id]} -> {versions[new_id]}")
+        if diff.empty:
+            st.write("No differences in exposures or results.")
+        else:
+            st.write(diff)
+
+    if selected(line):
+        st.write(f"### {line} over time")
+        history = assessment_history.line_history(line, entity=selected(entity), activity=selected(activity))
+        st.write(history)
+        st.line_chart(history, x="Created", y=["Physical Risk Result", "Transitional Risk Result"])
+
+
+def render(session_state):
+    section_5_assessment_history(session_state)
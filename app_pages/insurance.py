@@ -0,0 +1,151 @@
+import streamlit as st
+import pandas as pd
+
+from materiality_engine import encode_exposure, score_materiality
+from premium_ingestion import ingest_premiums
+from profiling import timed
+from reference_data import load_lob_factors, lob_factor_table
+from app_pages.shared import INSURANCE_EXPOSURE_OPTIONS, history_defaults, save_to_history, show_heatmap
+from app_pages.timings import timed_fragment
+
+# Insurance Activities page: section 1 questionnaire.
+
+
+def section_1_insurance_activities(session_state):
+    st.header("Materiality Assessment Questionnaire")
+
+    # Insurance Sector 
+    sectors = ["Please Select", "Life/Health", "NonLife", "Pension", "Composite"]
+    loaded = session_state.get_value("loaded_insurance_assessment")
+    loaded_sector = loaded.sector if loaded is not None and loaded.sector in sectors else sectors[0]
+    Sector = st.selectbox("Field of (re)insurance operation", sectors, index=sectors.index(loaded_sector),
+                          key="insurance_sector" + (f"_history{loaded.id}" if loaded is not None else ""))
+    session_state["insurance_sector"] = Sector
+
+    insurance_questionnaire(session_state)
+
+
+@st.fragment
+@timed_fragment("Insurance: questionnaire")
+def insurance_questionnaire(session_state):
+    # Runs as a fragment: submitting the exposure form only reruns this section
+
+    # Load the lines of business risk-factor table
+    with timed("Insurance: load reference data"):
+        df = load_lob_factors()
+
+    st.write("### 1. Insurance Activities")
+
+    # Optionally derive the exposures from policy-level premium data
+    premiums = premium_upload(session_state)
+    default_exposure, grid_source = history_defaults(session_state, "Insurance", df['Lines of Business'])
+    if premiums is not None:
+        default_exposure, grid_source = premiums.bands, session_state.get_value("premium_file_id")
+
+    # Define the width ratio for the legend and table sections
+    legend_width = 0.6  # Width ratio for legend
+    table_width = 0.2   # Width ratio for table
+
+    # Create a layout using st.columns to divide the page
+    columns = st.columns([legend_width, table_width])
+
+    # Column 1: Editable grid of exposures, applied in one batch on submit
+    with columns[0]:
+        with st.form("insurance_exposure_form"):
+            exposure_grid = pd.DataFrame({
+                "Line of Business (LoB)": df['Lines of Business'],
+                "LoB Exposure as Share of Total Net Premium": default_exposure,
+            }, index=pd.RangeIndex(1, len(df) + 1, name="#"))
+            edited_grid = st.data_editor(
+                exposure_grid,
+                column_config={
+                    "LoB Exposure as Share of Total Net Premium": st.column_config.SelectboxColumn(
+                        options=INSURANCE_EXPOSURE_OPTIONS, required=True, help="Select exposure level for each LoB"),
+                },
+                disabled=["Line of Business (LoB)"],
+                # Derived exposures from a new premium file or a loaded
+                # assessment start a fresh grid
+                key="insurance_exposure_grid_" + grid_source,
+                width="stretch",
+            )
+            st.form_submit_button("Update assessment")
+
+    # Column 2: Legend for materiality definitions
+    with columns[1]:
+        with st.container():
+            st.markdown("Legend: Exposure Share Definition") 
+            st.markdown("- **Low:** Less than 10%")
+            st.markdown("- **Medium:** Between 10% and 30%")
+            st.markdown("- **High:** More than 30%")
+        
+    # Update the DataFrame with the selected exposure materiality
+    df['Exposure Materiality'] = edited_grid["LoB Exposure as Share of Total Net Premium"].to_numpy()
+
+    # Filter out rows where exposure materiality is "Not relevant/No exposure"
+    df_filtered = df[df['Exposure Materiality'] != "Not relevant/No exposure"].copy()
+
+    # Calculate average risk factors based on exposure materiality
+    with timed("Insurance: scoring"):
+        physical_result, transitional_result = score_materiality(
+            encode_exposure(df_filtered['Exposure Materiality']),
+            df_filtered['Physical Risk Factor'],
+            df_filtered['Transition Risk Factor'],
+        )
+    df_filtered['Physical Risk Result'] = physical_result
+    df_filtered['Transitional Risk Result'] = transitional_result
+
+    # Display the heatmap and final table
+    st.write("### Heatmap and Results")
+
+    # Show the (cached) heatmap for the current selections
+    create_gradient_heatmap(df_filtered)
+
+    # Keep the inputs and results of this session's assessment
+    session_state["insurance_exposures"] = dict(zip(df['Lines of Business'], df['Exposure Materiality']))
+    session_state["insurance_results"] = df_filtered
+
+    st.header("Risk Factor Table")
+    df_display = df_filtered.copy()
+    df_display['Explanation'] = df_filtered['Explanation']
+    st.write(df_display)
+
+    sector = session_state.get_value("insurance_sector")
+    save_to_history(session_state, "Insurance", lob_factor_table(), df['Exposure Materiality'],
+                    sector=sector if sector != "Please Select" else None)
+
+
+def premium_upload(session_state):
+    # Upload policy-level premium data and derive exposure bands from it; the
+    # aggregated summary is kept in the session so the file is read once (and
+    # again only if the session store evicted the summary)
+    uploaded = st.file_uploader("Derive exposures from a premium file (optional)", type=["csv", "parquet"],
+                                help="One row per policy or contract with Line of Business (Short Name, e.g. MED, MTPL, FIRE) and Net Premium columns. "
+                                     "Uploads are held in memory and limited by server.maxUploadSize; run multi-GB files through premium_ingestion.py")
+    if uploaded is None:
+        session_state["premium_file_id"] = ""
+        session_state["premium_summary"] = None
+        return None
+
+    summary = session_state.get_value("premium_summary")
+    if summary is None or session_state.get_value("premium_file_id") != uploaded.file_id:
+        try:
+            uploaded.seek(0)
+            summary = ingest_premiums(uploaded, file_name=uploaded.name)
+        except (ValueError, ImportError) as exc:
+            st.error(f"Could not read the premium file: {exc}")
+            return None
+        session_state["premium_summary"] = summary
+        session_state["premium_file_id"] = uploaded.file_id
+
+    st.caption(f"{summary.rows:,} policies read in {summary.elapsed:.2f}s ({summary.rows_per_second:,.0f} rows/s, "
+               f"{summary.megabytes_per_second:,.1f} MB/s); net premium not mapped to a LoB: {summary.unmapped_premium:,.2f}")
+    return summary
+
+
+def create_gradient_heatmap(df):
+    show_heatmap(df['Short Name'], df['Physical Risk Result'], df['Transitional Risk Result'], df['Exposure Materiality'],
+                 df['Explanation'], 'Insurance Lines of Business Heatmap', "Insurance: heatmap rendering")
+
+
+def render(session_state):
+    section_1_insurance_activities(session_state)
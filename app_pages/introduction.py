@@ -0,0 +1,25 @@
+import streamlit as st
+
+# Introduction page (landing page): text only, no heavy imports.
+
+
+def display_intro_and_disclaimer():
+    st.title("ESG Risk Materiality Assessment Narrative Tool")
+    
+    intro_text = """
+    This tool, ESG Risk Materiality Assessment Narrative Tool, provides functionality for (re)insurers to perform ESG risk materiality assessments reflecting requirements and guidelines by EIOPA. The tool supports identifying the activities that are related to ESG risk factors with a focus on climate and social aspects. The governance aspect is under development. The aim is to gauge the materiality of activities prone to ESG risks and pick up on the material risks for the quantitative analysis as required by the regulatory basis for the ORSA process. After materiality assessment, the tool suggests performing quantification using scenario narratives based on either NGFS, RCP, or even tailor-made scenarios. This tool helps CROs and risk experts perform bottom-up materiality assessments.
+    """
+    st.write(intro_text)
+    
+    disclaimer_text = """
+    **Disclaimer:**
+    
+    The tool does not necessarily reflect the views of regulatory authorities and should not be considered comprehensive regulatory guidance. The information within this tool has been produced by the industry for the industry's use. The recommendations provided are not intended to constitute financial or professional advice and should not be relied upon as such.
+    
+    For those interested in more detailed information about the NGFS scenarios, please refer to the [NGFS scenario portal](https://www.ngfs.net/ngfs-scenarios-portal/).
+    """
+    st.write(disclaimer_text)
+
+
+def render(session_state):
+    display_intro_and_disclaimer()
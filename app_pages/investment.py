@@ -0,0 +1,243 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from holdings_ingestion import ingest_holdings
+from materiality_engine import encode_exposure, score_materiality
+from profiling import timed
+from reference_data import asset_factor_table, load_asset_factors
+from sectoral_engine import CPRS_CATEGORIES, REGIONS, build_materiality_tensor, cprs_factors, dominant_breakdown, sectoral_transitional_result
+from app_pages.shared import ASSET_EXPOSURE_OPTIONS, history_defaults, save_to_history, show_heatmap
+from app_pages.timings import timed_fragment
+
+# Investment Activities page: sections 2.1 and 2.2.
+
+
+@st.fragment
+@timed_fragment("Investment: asset allocation")
+def section_2_1_asset_allocation(session_state):
+    # Section 2.1: Asset Allocation. Runs as a fragment: submitting the
+    # exposure form only reruns this section, plus section 2.2 when the set
+    # of relevant asset classes changes.
+    st.subheader("2.1 Asset Allocation")
+
+    # Load the asset class risk-factor table
+    with timed("Investment: load reference data"):
+        asset_df = load_asset_factors()
+
+    # Optionally derive the exposures from a holdings extract
+    holdings = holdings_upload(session_state)
+    default_exposure, grid_source = history_defaults(session_state, "Investment", asset_df['Asset Class'])
+    if holdings is not None:
+        default_exposure, grid_source = holdings.bands, session_state.get_value("holdings_file_id")
+
+    # Editable grid of asset class exposures, applied in one batch on submit
+    with st.form("asset_exposure_form"):
+        exposure_grid = pd.DataFrame({
+            "Asset Class": asset_df['Asset Class'],
+            "Asset Class Exposure as Share of Total Asset": default_exposure,
+        }, index=pd.RangeIndex(1, len(asset_df) + 1, name="#"))
+        edited_grid = st.data_editor(
+            exposure_grid,
+            column_config={
+                "Asset Class Exposure as Share of Total Asset": st.column_config.SelectboxColumn(
+                    options=ASSET_EXPOSURE_OPTIONS, required=True, help="Select exposure level for each asset class"),
+            },
+            disabled=["Asset Class"],
+            # Derived exposures from a new holdings file or a loaded
+            # assessment start a fresh grid
+            key="asset_exposure_grid_" + grid_source,
+            width="stretch",
+        )
+        st.form_submit_button("Update assessment")
+
+    asset_exposure = list(edited_grid["Asset Class Exposure as Share of Total Asset"])
+
+    # List to store relevant asset classes based on criteria (at least Medium exposure)
+    relevant_asset_classes = [
+        asset_class for asset_class, exposure in zip(asset_df['Asset Class'], asset_exposure)
+        if exposure not in ["Low", "Not relevant/No Exposure"]
+    ]
+
+    # Update the DataFrame with the selected asset exposure
+    asset_df['Exposure_Assets'] = asset_exposure
+
+    # Map string exposure levels to numeric values
+    asset_df['Exposure_Assets_Numeric'] = asset_df['Exposure_Assets'].map({
+        'Low': 1,
+        'Medium': 2,
+        'High': 3,
+        'Not relevant/No Exposure': -10
+    })
+
+    # Filter out rows where exposure is "Not relevant/No Exposure"
+    relevant_asset_df = asset_df[asset_df['Exposure_Assets'] != "Not relevant/No Exposure"].copy()
+
+    # Display the relevant asset allocation table with the new column
+    st.write("### Relevant Asset Allocation")
+    st.write(relevant_asset_df)
+
+    # Assume df is some DataFrame that needs to be updated with exposure materiality
+    df = pd.DataFrame({
+        'Asset Class': asset_df['Asset Class'],
+        'Short Name Asset': asset_df['Short Name Asset'],
+        'Transition Risk Factor': asset_df['Transition Risk Factor'],
+        'Physical Risk Factor': asset_df['Physical Risk Factor'],
+        'Exposure Materiality Asset': asset_exposure,
+        'Exposure_Assets_Numeric': asset_df['Exposure_Assets_Numeric']  # Add this line to include numeric exposure
+    })
+
+    # Calculate average exposure level for each risk factor ("Not relevant/No Exposure" yields NaN)
+    with timed("Investment: scoring"):
+        physical_result, transitional_result = score_materiality(
+            encode_exposure(df['Exposure Materiality Asset']),
+            df['Physical Risk Factor'],
+            df['Transition Risk Factor'],
+        )
+    df['Physical Risk Result'] = physical_result
+    df['Transitional Risk Result'] = transitional_result
+
+    # Create a DataFrame for the heatmap
+    heatmap_df = pd.DataFrame({
+        'Short Name Asset': df['Short Name Asset'],
+        'Physical Risk Result': df['Physical Risk Result'],
+        'Transitional Risk Result': df['Transitional Risk Result'],
+        'asset_exposure': df['Exposure Materiality Asset'],
+        'Explanation': asset_df['Explanation'],
+    })
+
+    # Display the heatmap and results
+    st.write("### Heatmap and Results")
+
+    # Show the (cached) heatmap for the current selections
+    create_gradient_heatmap_assets(heatmap_df)
+    save_to_history(session_state, "Investment", asset_factor_table(), asset_exposure)
+
+    # Share the results with Section 2.2 and refresh it when its inputs (the
+    # relevant asset classes and their exposures) have changed
+    sectoral_inputs = {asset_class: exposure for asset_class, exposure in zip(asset_df['Asset Class'], asset_exposure) if asset_class in relevant_asset_classes}
+    previous_inputs = session_state.get_value("sectoral_inputs")
+    session_state["sectoral_inputs"] = sectoral_inputs
+    session_state["asset_allocation_results"] = df
+    if previous_inputs is not None and previous_inputs != sectoral_inputs:
+        st.rerun(scope="app")
+
+    # Return relevant data for Section 2.2
+    return df
+
+
+def holdings_upload(session_state):
+    # Upload a holdings extract and derive exposure bands from it; the
+    # aggregated summary is kept in the session so the file is read once (and
+    # again only if the session store evicted the summary)
+    uploaded = st.file_uploader("Derive exposures from a holdings file (optional)", type=["csv", "parquet"],
+                                help="One row per holding with Asset Class, CPRS Sector, Region and Market Value columns. "
+                                     "Uploads are held in memory and limited by server.maxUploadSize; run multi-GB extracts through holdings_ingestion.py")
+    if uploaded is None:
+        session_state["holdings_file_id"] = ""
+        session_state["holdings_summary"] = None
+        return None
+
+    summary = session_state.get_value("holdings_summary")
+    if summary is None or session_state.get_value("holdings_file_id") != uploaded.file_id:
+        try:
+            uploaded.seek(0)
+            summary = ingest_holdings(uploaded, file_name=uploaded.name)
+        except (ValueError, ImportError) as exc:
+            st.error(f"Could not read the holdings file: {exc}")
+            return None
+        session_state["holdings_summary"] = summary
+        session_state["holdings_file_id"] = uploaded.file_id
+
+    st.caption(f"{summary.rows:,} holdings read in {summary.elapsed:.2f}s ({summary.rows_per_second:,.0f} rows/s); "
+               f"market value not mapped to an asset class: {summary.unmapped_value:,.2f}")
+    return summary
+
+
+@st.fragment
+@timed_fragment("Investment: sectoral breakdown")
+def section_2_2_sectoral_breakdown(df, session_state):
+    # Section 2.2: Sectoral and Regional Breakdown of Investment Activities.
+    # Runs as a fragment: submitting the CPRS form only reruns this section.
+    st.header("2.2 Sectoral and Regional Breakdown of Investment Activities")
+    st.write("Here we collect materiality levels for different asset classes across Climate Policy Relevant Sectors (CPRS) for those asset classes with a minimum medium materiality.")
+
+    # Asset classes flagged in section 2.1 with at least Medium exposure
+    relevant_df = df[df['Exposure Materiality Asset'].isin(["Medium", "High"])].reset_index(drop=True)
+    relevant_asset_classes = list(relevant_df['Asset Class'])
+    if not relevant_asset_classes:
+        st.info("No asset class has a minimum medium materiality in section 2.1.")
+        return
+
+    # Default answers: derived from the holdings file when one was uploaded
+    holdings = session_state.get_value("holdings_summary")
+    if holdings is not None:
+        rows = [holdings.asset_classes.index(asset_class) for asset_class in relevant_asset_classes]
+        # (asset class, category, region) -> rows of (asset class, region), columns of category
+        defaults = holdings.sector_bands[rows].transpose(0, 2, 1).reshape(-1, len(CPRS_CATEGORIES))
+    else:
+        defaults = np.full((len(relevant_asset_classes) * len(REGIONS), len(CPRS_CATEGORIES)), "Medium", dtype=object)
+
+    # Editable (asset class, region) x CPRS category grid, applied in one batch on submit
+    with st.form("cprs_materiality_form"):
+        st.markdown("#### Sectoral breakdown")
+        materiality_grid = pd.DataFrame({
+            "Asset Class": np.repeat(relevant_asset_classes, len(REGIONS)),
+            "Region": np.tile(REGIONS, len(relevant_asset_classes)),
+            **{category: defaults[:, idx] for idx, category in enumerate(CPRS_CATEGORIES)},
+        })
+        edited_grid = st.data_editor(
+            materiality_grid,
+            column_config={
+                category: st.column_config.SelectboxColumn(
+                    options=ASSET_EXPOSURE_OPTIONS, required=True, help=f"Select materiality in {category}")
+                for category in CPRS_CATEGORIES
+            },
+            disabled=["Asset Class", "Region"],
+            hide_index=True,
+            # A new set of relevant asset classes starts a fresh grid
+            key="cprs_materiality_grid_" + "|".join(relevant_asset_classes) + session_state.get_value("holdings_file_id", ""),
+            width="stretch",
+        )
+        st.form_submit_button("Update sectoral breakdown")
+
+    # Rows are ordered by asset class, then region: reshape the answers into
+    # an asset class x CPRS category x region tensor
+    labels = edited_grid[CPRS_CATEGORIES].to_numpy().reshape(len(relevant_asset_classes), len(REGIONS), len(CPRS_CATEGORIES))
+    tensor = build_materiality_tensor(labels.transpose(0, 2, 1))
+
+    exposure_codes = encode_exposure(relevant_df['Exposure Materiality Asset'])
+    factors = cprs_factors(tensor)
+    dominant_category, dominant_region = dominant_breakdown(tensor)
+
+    results_df = pd.DataFrame({
+        'Asset Class': relevant_df['Asset Class'],
+        'Short Name Asset': relevant_df['Short Name Asset'],
+        'Exposure Materiality Asset': relevant_df['Exposure Materiality Asset'],
+        'CPRS Factor': factors,
+        'Dominant CPRS Category': np.where(factors > 0, np.array(CPRS_CATEGORIES, dtype=object)[dominant_category], "-"),
+        'Dominant Region': np.where(factors > 0, np.array(REGIONS, dtype=object)[dominant_region], "-"),
+        'Physical Risk Result': relevant_df['Physical Risk Result'],
+        'Transitional Risk Result': sectoral_transitional_result(exposure_codes, tensor),
+    })
+
+    # Display the CPRS-adjusted heatmap and results
+    st.write("### Sectoral Heatmap and Results")
+    explanations = [f"CPRS factor {factor} (dominant: {category}, {region})" for factor, category, region
+                    in zip(results_df['CPRS Factor'], results_df['Dominant CPRS Category'], results_df['Dominant Region'])]
+    show_heatmap(results_df['Short Name Asset'], results_df['Physical Risk Result'], results_df['Transitional Risk Result'],
+                 results_df['Exposure Materiality Asset'], explanations, 'Investment Classes Heatmap (CPRS-adjusted)',
+                 "Investment: sectoral heatmap rendering")
+    st.write(results_df)
+
+
+def create_gradient_heatmap_assets(df):
+    show_heatmap(df['Short Name Asset'], df['Physical Risk Result'], df['Transitional Risk Result'], df['asset_exposure'],
+                 df['Explanation'], 'Investment Classes Heatmap', "Investment: heatmap rendering")
+
+
+def render(session_state):
+    section_2_1_asset_allocation(session_state)
+    results = session_state.get_value("asset_allocation_results")
+    if results is not None:
+        section_2_2_sectoral_breakdown(results, session_state)
@@ -0,0 +1,25 @@
+import streamlit as st
+
+# Methodology page: text only, no heavy imports.
+
+
+def Methodology_Text():
+    st.header("Methodology")
+    st.write("This is the detailed methodology page where you can explain your methodology in depth.")
+    # Add more content as needed.
+
+    # st.title("Methodology")
+    
+    # Add your Methology Content here
+    
+    #Methodology_text = """
+    #**Environmental Risk Factors - Investments:** 
+    
+    #This section provides an overview of the how the investments risk factors for the environmental risks are selected. 
+    
+    #"""
+    #st.write(Methodology_text)
+
+
+def render(session_state):
+    Methodology_Text()
@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from scenario_engine import SCENARIOS, Scenario, material_lines, run_scenario
+
+# Scenario Analysis page: section 3.
+
+
+def material_lines_for_scenarios(session_state):
+    # Material lines of business and asset classes of this session's
+    # assessment with their volumes, and whether the volumes are currency
+    # amounts. Uploaded net premiums and market values are only used when
+    # every activity assessed has them; otherwise every line has a unit
+    # volume, so the total never adds currency amounts to shares
+    sides = []
+    insurance = session_state.get_value("insurance_results")
+    if insurance is not None:
+        premiums = session_state.get_value("premium_summary")
+        sides.append((insurance['Lines of Business'], insurance,
+                      dict(zip(premiums.lines_of_business, premiums.net_premiums)) if premiums is not None else None))
+    assets = session_state.get_value("asset_allocation_results")
+    if assets is not None:
+        holdings = session_state.get_value("holdings_summary")
+        sides.append((assets['Asset Class'], assets,
+                      dict(zip(holdings.asset_classes, holdings.market_values)) if holdings is not None else None))
+    if not sides:
+        return None, False
+
+    currency = all(volumes is not None for _, _, volumes in sides)
+    lines = pd.concat([
+        pd.DataFrame({
+            'Line': names,
+            'Physical Risk Result': results['Physical Risk Result'],
+            'Transitional Risk Result': results['Transitional Risk Result'],
+            # A line missing from the uploaded data has no premium / holdings
+            'Volume': names.map(volumes).fillna(0.0) if currency else 1.0,
+        })
+        for names, results, volumes in sides
+    ], ignore_index=True)
+    material = lines[material_lines(lines['Physical Risk Result'], lines['Transitional Risk Result'])].reset_index(drop=True)
+    return material, currency
+
+
+def section_3_scenario_analysis(session_state):
+    # Section 3: quantification of the material lines with scenario narratives
+    st.header("3. Scenario Analysis")
+    st.write("Material lines of business and asset classes (at least Medium physical or transitional risk on the heatmaps) are quantified with Monte Carlo simulations of NGFS, RCP or tailor-made scenario shocks.")
+
+    lines, currency = material_lines_for_scenarios(session_state)
+    if lines is None or lines.empty:
+        st.info("No material lines yet. Complete the Insurance Activities and/or Investment Activities pages first.")
+        return
+    if currency:
+        st.caption("Volumes are the uploaded net premiums and market values; losses and the total are currency amounts.")
+    else:
+        st.caption("Every line has a volume of 1, so losses are shares of the line's volume and the total is a sum of shares. "
+                   "Upload premium data and holdings data for all activities assessed to use currency amounts.")
+    st.write(lines)
+
+    with st.form("scenario_form"):
+        scenario_name = st.selectbox("Scenario", list(SCENARIOS) + ["Tailor-made"])
+        st.markdown("Tailor-made scenario parameters")
+        custom_cols = st.columns(4)
+        transition_shock = custom_cols[0].number_input("Transition shock", 0.0, 1.0, 0.05, step=0.01)
+        physical_shock = custom_cols[1].number_input("Physical shock", 0.0, 1.0, 0.05, step=0.01)
+        volatility = custom_cols[2].number_input("Volatility", 0.0, 3.0, 0.5, step=0.1)
+        correlation = custom_cols[3].number_input("Correlation", 0.0, 1.0, 0.5, step=0.1)
+        run_cols = st.columns(2)
+        n_paths = run_cols[0].selectbox("Number of paths", [10_000, 100_000, 1_000_000], index=1)
+        seed = run_cols[1].number_input("Random seed", 0, 2**32 - 1, 42)
+        submitted = st.form_submit_button("Run simulation")
+
+    if submitted:
+        if scenario_name == "Tailor-made":
+            scenario = Scenario("Tailor-made", transition_shock, physical_shock, volatility, correlation)
+        else:
+            scenario = SCENARIOS[scenario_name]
+        with st.spinner(f"Simulating {n_paths:,} paths..."):
+            summary, total = run_scenario(scenario, lines['Line'], lines['Physical Risk Result'], lines['Transitional Risk Result'],
+                                          volumes=lines['Volume'], n_paths=n_paths, seed=int(seed))
+        counts, edges = np.histogram(total, bins=50)
+        session_state["scenario_results"] = {
+            "scenario": scenario.name,
+            "summary": summary,
+            "histogram": pd.DataFrame({"Total Loss": (edges[:-1] + edges[1:]) / 2, "Paths": counts}),
+        }
+
+    results = session_state.get_value("scenario_results")
+    if results is not None:
+        st.write(f"### Loss distribution - {results['scenario']}")
+        st.write(results["summary"])
+        st.bar_chart(results["histogram"], x="Total Loss", y="Paths")
+
+
+def render(session_state):
+    section_3_scenario_analysis(session_state)
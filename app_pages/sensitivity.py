@@ -0,0 +1,68 @@
+import streamlit as st
+import pandas as pd
+
+from materiality_engine import encode_exposure
+from reference_data import asset_factor_table, lob_factor_table
+from sensitivity_analysis import analyse, parse_choices, stability
+
+# Sensitivity Analysis page: section 4.
+
+SENSITIVITY_LEVELS = ["Low", "Medium", "High", "Not relevant"]
+
+
+def section_4_sensitivity_analysis(session_state):
+    # Section 4: what-if analysis over all exposure combinations of a questionnaire
+    st.header("4. Sensitivity Analysis")
+    st.write("Evaluates every combination of exposure answers (or the subspace of the answers ticked below) and shows where the average result lands on the heatmap, which lines drive each outcome and how stable the current assessment is.")
+
+    activity = st.radio("Questionnaire", ["Insurance Activities", "Investment Activities"], horizontal=True)
+    if activity == "Insurance Activities":
+        table = lob_factor_table()
+        exposures = session_state.get_value("insurance_exposures")
+        current = [exposures[name] for name in table.names] if exposures else None
+    else:
+        table = asset_factor_table()
+        assets = session_state.get_value("asset_allocation_results")
+        current = list(assets['Exposure Materiality Asset']) if assets is not None else None
+
+    with st.form("sensitivity_form"):
+        choice_grid = pd.DataFrame({"Line": table.names, **{level: True for level in SENSITIVITY_LEVELS}})
+        edited_grid = st.data_editor(choice_grid, disabled=["Line"], hide_index=True, key=f"sensitivity_grid_{activity}", width="stretch")
+        submitted = st.form_submit_button("Evaluate all combinations")
+
+    results = session_state.get_value("sensitivity_results") or {}
+    if submitted:
+        selected = [[level for level in SENSITIVITY_LEVELS if row[level]] for _, row in edited_grid.iterrows()]
+        if not all(selected):
+            st.error("Tick at least one exposure answer for every line.")
+            return
+        with st.spinner("Evaluating combinations..."):
+            results = {**results, activity: analyse(table.short_names, table.physical_factors, table.transition_factors, parse_choices(selected))}
+        session_state["sensitivity_results"] = results
+
+    result = results.get(activity)
+    if result is None:
+        return
+    st.caption(f"{result.n_states:,} combinations evaluated in {result.elapsed:.2f}s")
+
+    columns = st.columns(2)
+    with columns[0]:
+        st.write("### Distribution of outcomes")
+        st.dataframe(result.cell_distribution().style.format("{:.1%}").background_gradient(cmap="Reds", axis=None))
+    with columns[1]:
+        st.write("### Number of material lines")
+        st.bar_chart(result.material_distribution(), x="Material Lines", y="Share of States")
+
+    st.write("### Drivers of the most frequent outcomes")
+    st.write(result.drivers())
+
+    if current is not None:
+        share, sensitive = stability(encode_exposure(current), table.physical_factors, table.transition_factors)
+        st.write("### Stability of the current assessment")
+        st.write(f"{share:.0%} of single-answer changes keep the outcome cell of the current assessment.")
+        if sensitive:
+            st.write("Lines whose change moves the outcome: " + ", ".join(table.short_names[j] for j in sensitive))
+
+
+def render(session_state):
+    section_4_sensitivity_analysis(session_state)
@@ -0,0 +1,53 @@
+import streamlit as st
+
+from assessment_history import assessment_history
+from interactive_heatmap import heatmap_spec
+from profiling import timed
+from app_pages import HEATMAP_MODES
+
+# Helpers shared by the assessment pages: exposure options, heatmaps and
+# the assessment history forms.
+
+# Options of the exposure selectboxes
+INSURANCE_EXPOSURE_OPTIONS = ["Low", "Medium", "High", "Not relevant/No exposure"]
+ASSET_EXPOSURE_OPTIONS = ["Low", "Medium", "High", "Not relevant/No Exposure"]
+
+
+def show_heatmap(labels, physical, transitional, exposures, explanations, title, timing_label):
+    # Interactive mode sends only the point data and a Vega-Lite spec to the
+    # browser; static mode renders a PNG on the server (the gradient
+    # background and the rendered PNG are cached by the rendering layer)
+    with timed(timing_label):
+        if st.session_state.get("heatmap_mode", HEATMAP_MODES[0]) == "Interactive":
+            spec = heatmap_spec(labels, physical, transitional, exposures, explanations, title)
+            st.vega_lite_chart(spec, width="content", theme=None)
+        else:
+            # matplotlib is only loaded once a static chart is requested
+            from heatmap_rendering import heatmap_points, render_heatmap_png
+            points = heatmap_points(labels, physical, transitional, exposures)
+            st.image(render_heatmap_png(points, title), width="stretch")
+
+
+def history_defaults(session_state, activity, names):
+    # Default exposure answers from an assessment loaded on the Assessment
+    # History page, and the grid key suffix that identifies it
+    loaded = session_state.get_value(f"loaded_{activity.lower()}_assessment")
+    if loaded is None:
+        return "Medium", ""
+    exposures = loaded.exposures
+    return [exposures.get(name, "Medium") for name in names], f"history{loaded.id}"
+
+
+def save_to_history(session_state, activity, table, exposures, sector=None):
+    # Persist the current inputs and results to the local assessment history
+    with st.form(f"save_{activity.lower()}_assessment_form"):
+        entity = st.text_input("Entity", value=session_state.get_value("history_entity", ""), placeholder="Legal entity name")
+        submitted = st.form_submit_button("Save to assessment history")
+    if submitted:
+        entity = entity.strip()
+        if not entity:
+            st.error("Enter the entity the assessment belongs to.")
+            return
+        assessment_id = assessment_history.save(entity, activity, table, exposures, sector=sector)
+        session_state["history_entity"] = entity
+        st.success(f"Saved as assessment #{assessment_id}.")
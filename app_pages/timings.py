@@ -0,0 +1,36 @@
+import streamlit as st
+
+from app_pages import PAGE_MODULES
+from profiling import profile_fragment, startup_report
+
+# Timing panels of the optional profiling (ESG_PROFILE=1, see profiling.py).
+# Full reruns show theirs in the sidebar; fragments cannot write to the
+# sidebar, so a fragment rerun shows its timings below the fragment.
+
+
+def _rerun_timings(timings):
+    st.write(f"**{timings.page}**: {timings.total * 1000:.1f} ms")
+    st.dataframe({"Section": [label for label, _ in timings.sections],
+                  "Seconds": [seconds for _, seconds in timings.sections]}, hide_index=True)
+    st.caption(f"cProfile dump: {timings.profile_path}")
+
+
+def show_timing_panel(timings):
+    with st.sidebar.expander("Rerun timings", expanded=True):
+        _rerun_timings(timings)
+    with st.sidebar.expander("Startup timings"):
+        rows = startup_report(PAGE_MODULES)
+        st.dataframe({"Page": [row[0] for row in rows],
+                      "First import (s)": [row[1] for row in rows],
+                      "First render (s)": [row[2] for row in rows],
+                      "Since process start (s)": [row[3] for row in rows]}, hide_index=True)
+
+
+def show_fragment_timings(timings):
+    with st.expander("Fragment rerun timings", expanded=True):
+        _rerun_timings(timings)
+
+
+def timed_fragment(label):
+    # Profiling decorator for the st.fragment functions of the pages
+    return profile_fragment(label, show_fragment_timings)
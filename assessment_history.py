@@ -0,0 +1,221 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from materiality_engine import encode_exposure, score_materiality
+
+# Persistent history of materiality assessments in a local SQLite database.
+#
+# Every saved assessment is one row of `assessments` (entity, activity,
+# sector, timestamp and the version of the risk-factor file it was scored
+# with) plus one row per line of business or asset class in
+# `assessment_lines`, holding the exposure answer, the factors and the
+# results. The indexes on (entity, activity, created_at) and on
+# (line, assessment_id) keep the queries by entity, date and line
+# independent of the size of the history, and diffs between two runs are
+# computed by a join inside SQLite, so only the changed lines are read.
+#
+# Connections are opened per thread; the database runs in WAL mode so the
+# Streamlit script threads can read while another one saves.
+
+HISTORY_DB = os.environ.get("ESG_HISTORY_DB", "assessment_history.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    entity TEXT NOT NULL,
+    activity TEXT NOT NULL,
+    sector TEXT,
+    created_at TEXT NOT NULL,
+    factor_version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assessments_entity ON assessments (entity, activity, created_at);
+CREATE INDEX IF NOT EXISTS assessments_created ON assessments (created_at);
+CREATE TABLE IF NOT EXISTS assessment_lines (
+    assessment_id INTEGER NOT NULL REFERENCES assessments (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    line TEXT NOT NULL,
+    short_name TEXT NOT NULL,
+    exposure TEXT NOT NULL,
+    physical_factor INTEGER NOT NULL,
+    transition_factor INTEGER NOT NULL,
+    physical_result REAL,
+    transitional_result REAL,
+    PRIMARY KEY (assessment_id, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assessment_lines_line ON assessment_lines (line, assessment_id);
+"""
+
+ASSESSMENT_COLUMNS = ["ID", "Entity", "Activity", "Sector", "Created", "Factor Version"]
+LINE_COLUMNS = ["Line", "Short Name", "Exposure", "Physical Risk Factor", "Transition Risk Factor",
+                "Physical Risk Result", "Transitional Risk Result"]
+
+
+@dataclass(frozen=True)
+class StoredAssessment:
+    id: int
+    entity: str
+    activity: str
+    sector: str
+    created_at: str
+    factor_version: str
+    lines: pd.DataFrame  # LINE_COLUMNS, in questionnaire order
+
+    @property
+    def exposures(self):
+        return dict(zip(self.lines["Line"], self.lines["Exposure"]))
+
+
+class AssessmentHistory:
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def save(self, entity, activity, table, exposures, sector=None, created_at=None):
+        # Score the exposure answers (one label per row of the risk-factor
+        # table) and store inputs and results; returns the new assessment id
+        exposures = [str(label) for label in exposures]
+        if len(exposures) != len(table):
+            raise ValueError(f"Expected {len(table)} exposure answers, got {len(exposures)}")
+        physical, transitional = score_materiality(encode_exposure(exposures), table.physical_factors, table.transition_factors)
+        created_at = created_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO assessments (entity, activity, sector, created_at, factor_version) VALUES (?, ?, ?, ?, ?)",
+                (entity, activity, sector, created_at, table.version),
+            )
+            assessment_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO assessment_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                zip([assessment_id] * len(table), range(len(table)), table.names, table.short_names, exposures,
+                    table.physical_factors.tolist(), table.transition_factors.tolist(),
+                    _nullable(physical), _nullable(transitional)),
+            )
+        return assessment_id
+
+    def entities(self):
+        return [row[0] for row in self._connection().execute("SELECT DISTINCT entity FROM assessments ORDER BY entity")]
+
+    def assessments(self, entity=None, activity=None, since=None, until=None, line=None, limit=200):
+        # Saved assessments, newest first; since/until are ISO dates or
+        # timestamps, line restricts to assessments that include that line
+        conditions, params = [], []
+        for column, op, value in (("entity", "=", entity), ("activity", "=", activity),
+                                  ("created_at", ">=", since), ("created_at", "<", _next_day(until))):
+            if value:
+                conditions.append(f"{column} {op} ?")
+                params.append(value)
+        if line:
+            conditions.append("EXISTS (SELECT 1 FROM assessment_lines WHERE assessment_id = id AND line = ?)")
+            params.append(line)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection().execute(
+            f"SELECT id, entity, activity, sector, created_at, factor_version FROM assessments {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return pd.DataFrame(rows, columns=ASSESSMENT_COLUMNS)
+
+    def load(self, assessment_id):
+        conn = self._connection()
+        meta = conn.execute(
+            "SELECT id, entity, activity, sector, created_at, factor_version FROM assessments WHERE id = ?",
+            (assessment_id,),
+        ).fetchone()
+        if meta is None:
+            raise KeyError(assessment_id)
+        rows = conn.execute(
+            "SELECT line, short_name, exposure, physical_factor, transition_factor, physical_result, transitional_result "
+            "FROM assessment_lines WHERE assessment_id = ? ORDER BY position",
+            (assessment_id,),
+        ).fetchall()
+        lines = pd.DataFrame(rows, columns=LINE_COLUMNS).astype({"Physical Risk Result": float, "Transitional Risk Result": float})
+        return StoredAssessment(*meta, lines=lines)
+
+    def line_history(self, line, entity=None, activity=None):
+        # Exposure and results of one line across the saved assessments,
+        # oldest first (e.g. for a year-over-year view)
+        conditions, params = ["l.line = ?"], [line]
+        for column, value in (("a.entity", entity), ("a.activity", activity)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        # With an entity, start from its assessments (CROSS JOIN fixes the
+        # join order in SQLite) rather than from every run of the line
+        join = "assessments AS a CROSS JOIN assessment_lines AS l" if entity else "assessment_lines AS l JOIN assessments AS a"
+        rows = self._connection().execute(
+            "SELECT a.id, a.entity, a.created_at, l.exposure, l.physical_result, l.transitional_result "
+            f"FROM {join} ON a.id = l.assessment_id "
+            f"WHERE {' AND '.join(conditions)} ORDER BY a.created_at, a.id",
+            params,
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["ID", "Entity", "Created", "Exposure", "Physical Risk Result", "Transitional Risk Result"])
+
+    def diff(self, old_id, new_id):
+        # Lines whose exposure or results differ between two assessments,
+        # including lines present in only one of them
+        rows = self._connection().execute(
+            """
+            SELECT o.line, o.short_name, o.exposure, n.exposure, o.physical_result, n.physical_result,
+                   o.transitional_result, n.transitional_result
+            FROM assessment_lines AS o
+            LEFT JOIN assessment_lines AS n ON n.assessment_id = :new AND n.line = o.line
+            WHERE o.assessment_id = :old
+              AND (n.line IS NULL OR o.exposure IS NOT n.exposure
+                   OR o.physical_result IS NOT n.physical_result OR o.transitional_result IS NOT n.transitional_result)
+            UNION ALL
+            SELECT n.line, n.short_name, NULL, n.exposure, NULL, n.physical_result, NULL, n.transitional_result
+            FROM assessment_lines AS n
+            WHERE n.assessment_id = :new
+              AND NOT EXISTS (SELECT 1 FROM assessment_lines AS o WHERE o.assessment_id = :old AND o.line = n.line)
+            """,
+            {"old": old_id, "new": new_id},
+        ).fetchall()
+        diff = pd.DataFrame(rows, columns=[
+            "Line", "Short Name", "Exposure (old)", "Exposure (new)", "Physical Risk Result (old)", "Physical Risk Result (new)",
+            "Transitional Risk Result (old)", "Transitional Risk Result (new)",
+        ]).astype({column: float for column in [
+            "Physical Risk Result (old)", "Physical Risk Result (new)", "Transitional Risk Result (old)", "Transitional Risk Result (new)",
+        ]})
+        diff["Physical Risk Change"] = diff["Physical Risk Result (new)"] - diff["Physical Risk Result (old)"]
+        diff["Transitional Risk Change"] = diff["Transitional Risk Result (new)"] - diff["Transitional Risk Result (old)"]
+        return diff
+
+
+def _nullable(values):
+    # NaN results (line not relevant) are stored as NULL
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+def _next_day(date):
+    # Upper bound for "until": a plain date includes that whole day
+    if date and len(str(date)) == 10:
+        return (pd.Timestamp(date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    return date
+
+
+assessment_history = AssessmentHistory()
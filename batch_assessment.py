@@ -0,0 +1,209 @@
+import argparse
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from materiality_engine import EXPOSURE_LEVELS, NOT_RELEVANT, decode_exposure, encode_exposure, score_materiality, unknown_exposure_labels
+from reference_data import asset_factor_table, lob_factor_table
+
+# Headless batch runner for the materiality assessment of many legal entities.
+#
+# Input is a CSV file with one row per entity and line of business or asset
+# class:
+#
+#     Entity,Line,Exposure
+#     Subsidiary A,MED,Medium
+#     Subsidiary A,Equity,High
+#     Subsidiary B,Fire and other damage to property insurance,Low
+#
+# "Line" may be the full name or the short name of a line of business or of an
+# asset class. "Exposure" is Low/Medium/High, or "Not relevant/No exposure" (any
+# label starting with "Not relevant", or blank); other labels are rejected.
+# Entities are scored in chunks across a process pool and every worker writes
+# the results tables of its own entities, so the run scales with the number of
+# cores. Streamlit is never imported.
+
+# Name of the consolidated results table next to the per-entity tables
+CONSOLIDATED_FILE = "consolidated"
+
+# Column names of the results tables
+RESULT_COLUMNS = [
+    "Entity", "Activity", "Line", "Short Name", "Transition Risk Factor", "Physical Risk Factor",
+    "Exposure Materiality", "Physical Risk Result", "Transitional Risk Result", "Explanation",
+]
+
+
+def build_line_table():
+    # Combine the lines of business and asset classes into one reference table
+    frames = []
+    for activity, table in (("Insurance", lob_factor_table()), ("Investment", asset_factor_table())):
+        frames.append(pd.DataFrame({
+            "Activity": activity,
+            "Line": table.names,
+            "Short Name": table.short_names,
+            "Transition Risk Factor": table.transition_factors,
+            "Physical Risk Factor": table.physical_factors,
+            "Explanation": table.explanations,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_exposures(path):
+    # Read the entity exposure file and validate the required columns
+    exposures = pd.read_csv(path, dtype=str)
+    missing = {"Entity", "Line", "Exposure"} - set(exposures.columns)
+    if missing:
+        raise ValueError(f"Exposure file {path} is missing columns: {', '.join(sorted(missing))}")
+    return exposures
+
+
+def line_positions(exposures, lines):
+    # Position in the line table of every row of the exposure file (by full
+    # or short name), and the entity position of every row
+    line_index = pd.concat([
+        pd.Series(lines.index, index=lines["Line"]),
+        pd.Series(lines.index, index=lines["Short Name"]),
+    ])
+    blank = _is_blank(exposures["Entity"])
+    if blank.any():
+        raise ValueError(f"Blank Entity in rows {_row_numbers(blank)}")
+    line_names = exposures["Line"].str.strip()
+    blank = _is_blank(line_names)
+    if blank.any():
+        raise ValueError(f"Blank Line in rows {_row_numbers(blank)}")
+    line_idx = line_names.map(line_index)
+    unknown = line_names[line_idx.isna()].unique()
+    if len(unknown):
+        raise ValueError(f"Unknown lines of business / asset classes: {', '.join(unknown)}")
+
+    entity_idx, entities = pd.factorize(exposures["Entity"])
+    return list(entities), entity_idx, line_idx.to_numpy(dtype=np.intp)
+
+
+def _is_blank(column):
+    return column.isna().to_numpy() | (column.fillna("").str.strip() == "").to_numpy()
+
+
+def _row_numbers(mask, limit=20):
+    # Line numbers in the CSV file (after the header) of the rows in mask
+    rows = [str(row) for row in np.flatnonzero(mask)[:limit] + 2]
+    return ", ".join(rows) + (", ..." if mask.sum() > limit else "")
+
+
+def exposure_labels(exposures):
+    # Stripped Exposure column; raises on labels that are neither an exposure
+    # band nor a "Not relevant" variant, rather than scoring them as not relevant
+    labels = exposures["Exposure"].str.strip()
+    unknown = unknown_exposure_labels(labels)
+    if unknown:
+        raise ValueError(f"Unknown exposure labels: {', '.join(unknown)} (expected {', '.join(EXPOSURE_LEVELS)} or Not relevant)")
+    return labels
+
+
+def encode_exposure_matrix(exposures, lines):
+    # Turn the long-format exposure file into a dense (n_entities, n_lines)
+    # matrix of categorical codes, plus a mask of the lines given per entity
+    entities, entity_idx, line_idx = line_positions(exposures, lines)
+    labels = exposure_labels(exposures)
+
+    codes = np.full((len(entities), len(lines)), NOT_RELEVANT, dtype=np.int8)
+    given = np.zeros(codes.shape, dtype=bool)
+    codes[entity_idx, line_idx] = encode_exposure(labels)
+    given[entity_idx, line_idx] = True
+    return entities, codes, given
+
+
+def entity_file_name(entity):
+    # File-system safe name for the per-entity results table
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(entity)).strip("_") or "entity"
+
+
+def entity_file_names(entities, reserved=()):
+    # Unique file names for a list of entities. Entities whose names sanitize
+    # to the same file name (compared case-insensitively, for case-insensitive
+    # file systems) or to a reserved name (another output file, e.g.
+    # "consolidated") get a short hash of the entity name appended, so no
+    # results file overwrites another and the names do not depend on the order
+    names = [entity_file_name(entity) for entity in entities]
+    counts = pd.Series(names, dtype=object).str.lower().value_counts()
+    reserved = {name.lower() for name in reserved}
+    taken = set(counts.index) | reserved
+    unique = []
+    for entity, name in zip(entities, names):
+        if counts[name.lower()] > 1 or name.lower() in reserved:
+            name = f"{name}_{hashlib.blake2b(str(entity).encode(), digest_size=4).hexdigest()}"
+            suffix, candidate = 1, name
+            while candidate.lower() in taken:
+                suffix += 1
+                candidate = f"{name}_{suffix}"
+            name = candidate
+            taken.add(name.lower())
+        unique.append(name)
+    return unique
+
+
+def score_chunk(entities, file_names, codes, given, output_dir):
+    # Worker: score a chunk of entities and write one results table per entity
+    lines = build_line_table()
+    physical, transitional = score_materiality(codes, lines["Physical Risk Factor"], lines["Transition Risk Factor"])
+
+    results = []
+    for row, (entity, file_name) in enumerate(zip(entities, file_names)):
+        mask = given[row]
+        result = lines.loc[mask].copy()
+        result.insert(0, "Entity", entity)
+        result["Exposure Materiality"] = decode_exposure(codes[row, mask])
+        result["Physical Risk Result"] = physical[row, mask]
+        result["Transitional Risk Result"] = transitional[row, mask]
+        result = result[RESULT_COLUMNS]
+        result.to_csv(os.path.join(output_dir, f"{file_name}.csv"), index=False)
+        results.append(result)
+    return pd.concat(results, ignore_index=True) if results else pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def run_batch(input_path, output_dir, workers=None, chunk_size=None):
+    # Score every entity in input_path and write per-entity and consolidated results
+    os.makedirs(output_dir, exist_ok=True)
+    exposures = read_exposures(input_path)
+    entities, codes, given = encode_exposure_matrix(exposures, build_line_table())
+    file_names = entity_file_names(entities, reserved=[CONSOLIDATED_FILE])
+
+    workers = workers or os.cpu_count() or 1
+    # Default to a few chunks per worker so that uneven chunks balance out
+    chunk_size = chunk_size or max(1, -(-len(entities) // (workers * 4)))
+    bounds = range(0, len(entities), chunk_size)
+    chunks = [(entities[i:i + chunk_size], file_names[i:i + chunk_size], codes[i:i + chunk_size], given[i:i + chunk_size], output_dir) for i in bounds]
+
+    if workers == 1:
+        results = [score_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(score_chunk, *zip(*chunks))) if chunks else []
+
+    consolidated = pd.concat(results, ignore_index=True) if results else pd.DataFrame(columns=RESULT_COLUMNS)
+    consolidated.to_csv(os.path.join(output_dir, f"{CONSOLIDATED_FILE}.csv"), index=False)
+    return consolidated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch ESG risk materiality assessment for many legal entities.")
+    parser.add_argument("input", help="CSV file with Entity, Line and Exposure columns")
+    parser.add_argument("-o", "--output-dir", default="materiality_results", help="Directory for the results tables")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Entities per worker task")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    consolidated = run_batch(args.input, args.output_dir, workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    n_entities = consolidated["Entity"].nunique()
+    print(f"Assessed {n_entities} entities ({len(consolidated)} lines) in {elapsed:.2f}s -> {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
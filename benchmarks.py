@@ -0,0 +1,219 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app_pages import PAGE_MODULES
+
+# Benchmark suite for the materiality tool.
+#
+# Page benchmarks drive each page of LoB_Materiality.py headlessly through
+# Streamlit's app-testing harness (streamlit.testing.v1.AppTest) and time
+# complete reruns. Micro-benchmarks time the building blocks a rerun is made
+# of: reference data loading, scoring and heatmap rendering. Startup
+# benchmarks start a fresh interpreter per sample and time the first render
+# of each page (time to first paint) and the first import of its module, i.e.
+# what a newly started container pays.
+#
+# Results are the fastest of several repeats: noise from other processes only
+# ever adds time, so the minimum is the most stable estimate. Calls shorter
+# than MIN_SAMPLE_SECONDS are looped within each sample, so the timer
+# resolution does not dominate micro-benchmarks of a few microseconds. With
+# --save-baseline the results are written to the baseline file; otherwise they
+# are compared against it and the run fails when a benchmark is slower than
+# the baseline by more than the relative tolerance and by more than the
+# absolute noise floor, so regressions are caught in CI or before a release.
+# Benchmarks in UNGATED are reported but never fail the run: a cold matplotlib
+# render varies by 50% and more between runs on a shared machine even as the
+# fastest of ten samples, and is covered by the page benchmarks anyway.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "LoB_Materiality.py")
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# Shortest sample for the micro-benchmarks; faster calls are repeated within it
+MIN_SAMPLE_SECONDS = 0.005
+UNGATED = {"micro/render heatmap (cold)"}
+PAGES = list(PAGE_MODULES)
+
+# Run in a fresh interpreter: first render of the page given in argv (after
+# the landing page for every other page) and the first import of its module
+_COLD_START = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+from app_pages import PAGE_MODULES
+from profiling import startup_report
+app_path, page = sys.argv[1:3]
+app = AppTest.from_file(app_path, default_timeout=120)
+start = time.perf_counter()
+app.run()
+if page != "Introduction":
+    start = time.perf_counter()
+    app.sidebar.radio[0].set_value(page).run()
+elapsed = time.perf_counter() - start
+rows = {row[0]: row for row in startup_report(PAGE_MODULES)}
+print(json.dumps({"first_paint": elapsed, "import": rows[page][1], "since_start": rows[page][3]}))
+"""
+
+
+def measure(func, repeat, warmup=1, min_sample=MIN_SAMPLE_SECONDS):
+    # Fastest wall time of one call of func in seconds over repeat samples;
+    # every sample loops func often enough to last at least min_sample
+    for _ in range(warmup):
+        func()
+    number = 1
+    if min_sample:
+        start = time.perf_counter()
+        func()
+        number = max(1, int(min_sample / max(time.perf_counter() - start, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples)
+
+
+def page_benchmarks(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page in PAGES:
+        app = AppTest.from_file(APP_PATH, default_timeout=120)
+        app.run()
+        app.sidebar.radio[0].set_value(page).run()
+        if app.exception:
+            raise RuntimeError(f"Page {page!r} raised: {app.exception[0].value}")
+        results[f"page/{page}"] = measure(app.run, repeat, warmup=0, min_sample=0)
+    return results
+
+
+def startup_benchmarks(repeat):
+    results = {}
+    for page in PAGES:
+        samples = []
+        for _ in range(repeat):
+            completed = subprocess.run([sys.executable, "-c", _COLD_START, APP_PATH, page], capture_output=True, text=True,
+                                       cwd=os.path.dirname(APP_PATH), check=True)
+            samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        results[f"startup/{page} first paint"] = min(sample["first_paint"] for sample in samples)
+        results[f"startup/{page} page import"] = min(sample["import"] for sample in samples)
+        if page == PAGES[0]:
+            # Interpreter start to the landing page's first paint
+            results["startup/landing page since process start"] = min(sample["since_start"] for sample in samples)
+    return results
+
+
+def micro_benchmarks(repeat):
+    from heatmap_rendering import PngCache, heatmap_points, render_heatmap_png
+    from interactive_heatmap import heatmap_spec
+    from materiality_engine import score_materiality
+    from reference_data import LOB_FACTORS_FILE, load_lob_factors, lob_factor_table
+
+    table = lob_factor_table()
+    rng = np.random.default_rng(0)
+    single = rng.integers(0, 4, len(table)).astype(np.int8)
+    batch = rng.integers(0, 4, (10_000, len(table))).astype(np.int8)
+    physical, transitional = score_materiality(single, table.physical_factors, table.transition_factors)
+    exposures = np.array(["Medium"] * len(table))
+    points = heatmap_points(table.short_names, physical, transitional, exposures)
+    warm_cache = PngCache()
+    render_heatmap_png(points, "Benchmark", cache=warm_cache)
+    with open(LOB_FACTORS_FILE, "rb") as f:
+        raw_csv = f.read()
+
+    return {
+        "micro/parse reference csv": measure(lambda: pd.read_csv(io.BytesIO(raw_csv)), repeat),
+        "micro/load reference table (cached)": measure(lob_factor_table, repeat),
+        "micro/load reference frame": measure(load_lob_factors, repeat),
+        "micro/score 1 entity": measure(lambda: score_materiality(single, table.physical_factors, table.transition_factors), repeat),
+        "micro/score 10k entities": measure(lambda: score_materiality(batch, table.physical_factors, table.transition_factors), repeat),
+        "micro/render heatmap (cold)": measure(lambda: render_heatmap_png(points, "Benchmark", cache=None), max(5, repeat // 2)),
+        "micro/render heatmap (cached)": measure(lambda: render_heatmap_png(points, "Benchmark", cache=warm_cache), repeat),
+        "micro/interactive heatmap spec": measure(lambda: heatmap_spec(table.short_names, physical, transitional, exposures, table.explanations, "Benchmark"), repeat),
+    }
+
+
+def heatmap_payloads(n_points=300):
+    # Bytes sent to the browser for one heatmap of n_points lines: the
+    # interactive Vega-Lite spec against the static PNG
+    from heatmap_rendering import heatmap_points, render_heatmap_png
+    from interactive_heatmap import heatmap_spec, payload_size
+
+    rng = np.random.default_rng(0)
+    labels = [f"L{i}" for i in range(n_points)]
+    physical, transitional = rng.uniform(1, 3, n_points), rng.uniform(1, 3, n_points)
+    exposures = rng.choice(["Low", "Medium", "High"], n_points)
+    explanations = ["Explanation of the line of business shown on hover."] * n_points
+    spec = heatmap_spec(labels, physical, transitional, exposures, explanations, "Benchmark")
+    png = render_heatmap_png(heatmap_points(labels, physical, transitional, exposures), "Benchmark", cache=None)
+    return {"interactive spec": payload_size(spec), "static PNG": len(png)}
+
+
+def compare(results, baseline, tolerance, noise_floor):
+    # Print a comparison table; returns the names of regressed benchmarks,
+    # those slower than the baseline by more than the relative tolerance and
+    # by more than noise_floor seconds (UNGATED benchmarks are only flagged)
+    regressions = []
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference:
+            ratio = seconds / reference
+            flag = "REGRESSION" if ratio > 1 + tolerance and seconds - reference > noise_floor else ""
+            if flag and name in UNGATED:
+                flag = "slower (not gated)"
+            elif flag:
+                regressions.append(name)
+            print(f"{name:<{width}}  {seconds * 1000:10.3f} ms  baseline {reference * 1000:10.3f} ms  x{ratio:5.2f} {flag}")
+        else:
+            print(f"{name:<{width}}  {seconds * 1000:10.3f} ms  (no baseline)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Streamlit pages and the scoring/rendering functions.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--noise-floor", type=float, default=1.0,
+                        help="Slowdowns smaller than this many milliseconds are never regressions")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeats per benchmark")
+    parser.add_argument("--skip-pages", action="store_true", help="Skip the page and startup benchmarks")
+    parser.add_argument("--startup-repeat", type=int, default=3, help="Fresh interpreters per page for the startup benchmarks")
+    args = parser.parse_args(argv)
+
+    results = micro_benchmarks(args.repeat)
+    payloads = heatmap_payloads()
+    print("Heatmap payload (300 points): " + ", ".join(f"{kind} {size / 1024:,.1f} KB" for kind, size in payloads.items()) + "\n")
+    if not args.skip_pages:
+        results.update(page_benchmarks(max(1, args.repeat // 4)))
+        results.update(startup_benchmarks(args.startup_repeat))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "machine": platform.machine(), "results": results}, f, indent=2)
+        compare(results, {}, args.tolerance, args.noise_floor / 1000)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance, args.noise_floor / 1000)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%} "
+              f"and {args.noise_floor:g} ms: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
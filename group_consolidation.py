@@ -0,0 +1,199 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_assessment import build_line_table, exposure_labels, line_positions, read_exposures
+from materiality_engine import NOT_RELEVANT, decode_exposure, encode_exposure, score_materiality
+
+# Group consolidation of the materiality assessments of many subsidiaries.
+#
+# Input is the exposure file of the batch runner (Entity, Line, Exposure) with
+# an optional Volume column: the net premium of a line of business or the
+# market value of an asset class at that entity, required on every row when
+# the column is present. The group result of a line is the volume-weighted
+# average of the entity results over the entities for which the line is
+# relevant; without a Volume column (or where all of them have zero volume)
+# every entity weighs the same. The group exposure is the weighted average
+# exposure score, rounded to the nearest band.
+#
+# Entities are kept as dense (n_entities, n_lines) matrices and scored in one
+# vectorised step. The group aggregates are running per-line sums of the
+# weights and weighted results, so updating a subsidiary subtracts its old
+# contribution and adds the new one - O(n_lines) - instead of re-aggregating
+# the whole group.
+
+# Per-line accumulators: weight, weighted physical, weighted transitional,
+# weighted exposure score, volume of the entities for which the line is
+# relevant, number of relevant entities, number of those with a positive
+# weight, and the unweighted physical, transitional and exposure sums (the
+# equally weighted fallback for lines whose relevant entities all have zero
+# volume)
+(_WEIGHT, _PHYSICAL, _TRANSITIONAL, _EXPOSURE, _VOLUME, _ENTITIES, _WEIGHTED_ENTITIES,
+ _PLAIN_PHYSICAL, _PLAIN_TRANSITIONAL, _PLAIN_EXPOSURE) = range(10)
+_N_SUMS = 10
+
+
+def _contributions(codes, volumes, weighted, physical_factors, transition_factors):
+    # Contribution of entities (rows) to the per-line sums, shape (_N_SUMS, ..., n_lines)
+    physical, transitional = score_materiality(codes, physical_factors, transition_factors)
+    relevant = codes != NOT_RELEVANT
+    weights = np.where(relevant, volumes if weighted else 1.0, 0.0)
+    physical, transitional = np.nan_to_num(physical), np.nan_to_num(transitional)
+    return np.stack([
+        weights,
+        weights * physical,
+        weights * transitional,
+        weights * codes,
+        np.where(relevant, volumes, 0.0),
+        relevant.astype(np.float64),
+        (weights > 0).astype(np.float64),
+        physical,
+        transitional,
+        codes.astype(np.float64),
+    ])
+
+
+def _volumes(column):
+    # Volume column as floats; a blank, non-numeric or negative volume would
+    # silently change the weights, so it is rejected with its CSV row numbers
+    volumes = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64)
+    invalid = ~(volumes >= 0)
+    if invalid.any():
+        rows = ", ".join(str(row) for row in np.flatnonzero(invalid)[:20] + 2)
+        raise ValueError(f"Missing, non-numeric or negative Volume in rows {rows}{', ...' if invalid.sum() > 20 else ''}")
+    return volumes
+
+
+class GroupConsolidation:
+    def __init__(self, entities, codes, volumes=None, lines=None):
+        # codes: int8 (n_entities, n_lines) exposure codes against the line
+        # table; volumes: (n_entities, n_lines) premium / market value, or
+        # None to weight every entity equally
+        self.lines = build_line_table() if lines is None else lines
+        self.entities = list(entities)
+        self._entity_index = {entity: row for row, entity in enumerate(self.entities)}
+        self.weighted = volumes is not None
+        self.codes = np.asarray(codes, dtype=np.int8).copy()
+        self.volumes = np.zeros(self.codes.shape) if volumes is None else np.asarray(volumes, dtype=np.float64).copy()
+        self._physical_factors = self.lines["Physical Risk Factor"].to_numpy(dtype=np.float64)
+        self._transition_factors = self.lines["Transition Risk Factor"].to_numpy(dtype=np.float64)
+        self.recompute()
+
+    @classmethod
+    def from_exposures(cls, exposures):
+        # Build from a long-format exposure DataFrame (see read_exposures)
+        lines = build_line_table()
+        entities, entity_idx, line_idx = line_positions(exposures, lines)
+        codes = np.full((len(entities), len(lines)), NOT_RELEVANT, dtype=np.int8)
+        codes[entity_idx, line_idx] = encode_exposure(exposure_labels(exposures))
+        volumes = None
+        if "Volume" in exposures.columns:
+            volumes = np.zeros(codes.shape)
+            volumes[entity_idx, line_idx] = _volumes(exposures["Volume"])
+        return cls(entities, codes, volumes, lines=lines)
+
+    def _entity_contributions(self, rows):
+        return _contributions(self.codes[rows], self.volumes[rows], self.weighted, self._physical_factors, self._transition_factors)
+
+    def recompute(self):
+        # Aggregate all entities from scratch
+        self._sums = self._entity_contributions(slice(None)).sum(axis=1) if self.entities else np.zeros((_N_SUMS, len(self.lines)))
+
+    def update_entity(self, entity, codes, volumes=None):
+        # Replace the exposures (and volumes) of one subsidiary, adding it if
+        # it is new, and update the group sums incrementally
+        codes = np.asarray(codes, dtype=np.int8)
+        row = self._entity_index.get(entity)
+        if row is None:
+            row = len(self.entities)
+            self.entities.append(entity)
+            self._entity_index[entity] = row
+            self.codes = np.vstack([self.codes, np.full((1, len(self.lines)), NOT_RELEVANT, dtype=np.int8)])
+            self.volumes = np.vstack([self.volumes, np.zeros((1, len(self.lines)))])
+        old = self._entity_contributions(row)
+        self.codes[row] = codes
+        if volumes is not None:
+            self.volumes[row] = volumes
+        self._sums += self._entity_contributions(row) - old
+
+    def group_results(self, activity=None):
+        # The entity counts are exact; weight sums left by incremental
+        # updates may carry rounding residue where the last weighted entity
+        # was removed. Lines whose relevant entities all have zero volume are
+        # averaged with equal weights rather than dropped
+        entities = self._sums[_ENTITIES]
+        valid = entities > 0.5
+        weighted = self._sums[_WEIGHTED_ENTITIES] > 0.5
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(weighted, self._sums[_WEIGHT], entities)
+            sums = {column: np.where(weighted, self._sums[column], self._sums[plain]) for column, plain in
+                    ((_PHYSICAL, _PLAIN_PHYSICAL), (_TRANSITIONAL, _PLAIN_TRANSITIONAL), (_EXPOSURE, _PLAIN_EXPOSURE))}
+            physical = np.where(valid, sums[_PHYSICAL] / weight, np.nan)
+            transitional = np.where(valid, sums[_TRANSITIONAL] / weight, np.nan)
+            exposure = np.where(valid, np.rint(sums[_EXPOSURE] / weight), NOT_RELEVANT)
+        results = pd.DataFrame({
+            "Activity": self.lines["Activity"],
+            "Line": self.lines["Line"],
+            "Short Name": self.lines["Short Name"],
+            "Volume": self._sums[_VOLUME],
+            "Entities": self._sums[_ENTITIES].round().astype(np.int64),
+            "Exposure Materiality": decode_exposure(exposure.astype(np.int8)),
+            "Physical Risk Result": physical,
+            "Transitional Risk Result": transitional,
+            "Explanation": self.lines["Explanation"],
+        })
+        if not self.weighted:
+            results = results.drop(columns="Volume")
+        return results if activity is None else results[results["Activity"] == activity].reset_index(drop=True)
+
+    def entity_results(self, entity):
+        # Results of one subsidiary (drill-down from the group)
+        row = self._entity_index[entity]
+        physical, transitional = score_materiality(self.codes[row], self._physical_factors, self._transition_factors)
+        results = self.lines[["Activity", "Line", "Short Name", "Explanation"]].copy()
+        results.insert(3, "Exposure Materiality", decode_exposure(self.codes[row]))
+        results.insert(4, "Physical Risk Result", physical)
+        results.insert(5, "Transitional Risk Result", transitional)
+        if self.weighted:
+            results.insert(3, "Volume", self.volumes[row])
+        return results
+
+    def line_contributions(self, line):
+        # Entities contributing to the group result of one line, by weight
+        position = int(np.flatnonzero(self.lines["Line"] == line)[0])
+        codes = self.codes[:, position]
+        relevant = codes != NOT_RELEVANT
+        weights = np.where(relevant, self.volumes[:, position] if self.weighted else 1.0, 0.0)
+        physical, transitional = score_materiality(codes, self._physical_factors[position], self._transition_factors[position])
+        total = weights.sum()
+        contributions = pd.DataFrame({
+            "Entity": self.entities,
+            "Exposure Materiality": decode_exposure(codes),
+            "Weight": weights / total if total > 0 else 0.0,
+            "Physical Risk Result": physical,
+            "Transitional Risk Result": transitional,
+        })
+        if self.weighted:
+            contributions.insert(2, "Volume", self.volumes[:, position])
+        return contributions[relevant].sort_values("Weight", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consolidate the materiality assessments of many subsidiaries to group level.")
+    parser.add_argument("input", help="CSV file with Entity, Line, Exposure and optional Volume columns")
+    parser.add_argument("-o", "--output", default="group_results.csv", help="Group results CSV")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    group = GroupConsolidation.from_exposures(read_exposures(args.input))
+    results = group.group_results()
+    results.to_csv(args.output, index=False)
+    elapsed = time.perf_counter() - start
+    weighting = "volume-weighted" if group.weighted else "equally weighted"
+    print(f"Consolidated {len(group.entities)} entities ({weighting}) in {elapsed:.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
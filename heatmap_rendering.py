@@ -0,0 +1,155 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
+
+from heatmap_style import AXIS_MAX, AXIS_MIN, SIZE_MAP
+
+# Rendering layer for the materiality heatmaps.
+#
+# The green-yellow-red gradient background never changes, so it is computed
+# once as an RGBA image and only the scatter points and labels are drawn per
+# request. Figures are created with the object-oriented Agg API rather than
+# pyplot, so they are never registered globally and are freed as soon as the
+# PNG bytes have been produced. The PNG bytes are memoized in an LRU cache
+# keyed by the plotted points and bounded by total size in bytes.
+
+# Default memory budget of the PNG cache
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_ENTRIES = 256
+
+
+def _build_gradient_background():
+    # Combine X and Y to form the gradient; the colormap is normalised over the
+    # grid, so (X + Y) and (X + Y) / 2 give the same picture
+    cmap = LinearSegmentedColormap.from_list('custom', ['green', 'yellow', 'red'])
+    X, Y = np.meshgrid(np.linspace(AXIS_MIN, AXIS_MAX, 100), np.linspace(AXIS_MIN, AXIS_MAX, 100))
+    Z = X + Y
+    rgba = cmap((Z - Z.min()) / (Z.max() - Z.min()))
+    rgba[..., 3] = 0.5
+    rgba.flags.writeable = False
+    return rgba
+
+
+GRADIENT_BACKGROUND = _build_gradient_background()
+
+
+class PngCache:
+    # Thread-safe LRU cache of rendered PNG bytes bounded by entry count and
+    # by the total number of bytes held
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = png
+            self._size += len(png)
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+png_cache = PngCache()
+
+
+def heatmap_points(labels, physical, transitional, exposures):
+    # Normalise the points to plot into a hashable tuple, dropping points
+    # without a result (NaN), so it can be used as the cache key
+    points = []
+    for label, x, y, exposure in zip(labels, physical, transitional, exposures):
+        if np.isnan(x) or np.isnan(y):
+            continue
+        points.append((str(label), float(x), float(y), str(exposure)))
+    return tuple(points)
+
+
+def draw_heatmap(ax, points, title):
+    # Draw the background, the points and their labels onto ax
+    ax.imshow(GRADIENT_BACKGROUND, origin='lower', extent=[AXIS_MIN, AXIS_MAX, AXIS_MIN, AXIS_MAX])
+
+    if points:
+        xs = [p[1] for p in points]
+        ys = [p[2] for p in points]
+        sizes = [SIZE_MAP[p[3]] for p in points]
+        ax.scatter(xs, ys, color='black', zorder=2, s=sizes)
+
+    # To avoid overlapping text, we will keep track of positions
+    text_positions = {}
+    for label, x, y, _ in points:
+        pos = (x, y)
+        if pos in text_positions:
+            text_positions[pos] += 0.1  # Increment y position slightly to avoid overlap
+        else:
+            text_positions[pos] = 0  # Initialize position
+
+        # Use short name and add a comma if there's an overlap
+        short_name = label if text_positions[pos] == 0 else label + ','
+        ax.text(x + 0.1, y + text_positions[pos], short_name, color='black', fontsize=8, zorder=3, ha='left', va='center')
+
+    # Set labels and title
+    ax.set_xlabel('Physical Risk')
+    ax.set_ylabel('Transitional Risk')
+    ax.set_xticks([1, 2, 3])
+    ax.set_xticklabels(['Low', 'Medium', 'High'])
+    ax.set_yticks([1, 2, 3])
+    ax.set_yticklabels(['Low', 'Medium', 'High'])
+    ax.set_title(title)
+
+    # Set axis limits
+    ax.set_xlim(AXIS_MIN, AXIS_MAX)
+    ax.set_ylim(AXIS_MIN, AXIS_MAX)
+
+
+def render_heatmap_png(points, title, dpi=200, cache=png_cache):
+    # Return the heatmap for points as PNG bytes, rendering it only on a cache miss
+    key = (title, dpi, points)
+    png = cache.get(key) if cache is not None else None
+    if png is not None:
+        return png
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    draw_heatmap(fig.add_subplot(), points, title)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    png = buffer.getvalue()
+
+    if cache is not None:
+        cache.put(key, png)
+    return png
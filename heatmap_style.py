@@ -0,0 +1,9 @@
+# Plot conventions shared by the static (matplotlib) and the interactive
+# (Vega-Lite) heatmaps. Kept free of imports so that the interactive charts do
+# not load matplotlib.
+
+# Axis range of the heatmap (risk results lie between 1 and 3)
+AXIS_MIN, AXIS_MAX = 0.5, 3.5
+
+# Circle sizes by exposure level
+SIZE_MAP = {'Low': 50, 'Medium': 150, 'High': 450}
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+
+from heatmap_style import AXIS_MAX, AXIS_MIN, SIZE_MAP
+from label_layout import place_labels
+
+# Client-side interactive heatmap.
+#
+# Instead of rasterising a matplotlib figure on the server, only the point
+# data (a few kilobytes) is sent to the browser together with a Vega-Lite
+# specification; the chart, including the green-yellow-red gradient, the hover
+# tooltips with the explanation text and the labels, is drawn by the client.
+# Label positions are computed with the collision-avoiding layout of
+# label_layout.py; labels moved away from their point get a leader line.
+
+CHART_WIDTH = 600
+CHART_HEIGHT = 450
+FONT_SIZE = 11
+
+AXIS_LABELS = {1: "Low", 2: "Medium", 3: "High"}
+
+
+def heatmap_spec(labels, physical, transitional, exposures, explanations, title):
+    # Vega-Lite spec with inline data for the points that have a result
+    keep = ~(np.isnan(np.asarray(physical, dtype=np.float64)) | np.isnan(np.asarray(transitional, dtype=np.float64)))
+    labels = [str(v) for v, k in zip(labels, keep) if k]
+    physical = np.asarray(physical, dtype=np.float64)[keep]
+    transitional = np.asarray(transitional, dtype=np.float64)[keep]
+    exposures = [str(v) for v, k in zip(exposures, keep) if k]
+    explanations = [str(v) for v, k in zip(explanations, keep) if k]
+    sizes = [SIZE_MAP.get(e, SIZE_MAP["Medium"]) for e in exposures]
+
+    label_x, label_y, moved = place_labels(
+        physical, transitional, labels, (AXIS_MIN, AXIS_MAX), (AXIS_MIN, AXIS_MAX),
+        width=CHART_WIDTH, height=CHART_HEIGHT, font_size=FONT_SIZE, marker_sizes=sizes,
+    )
+    values = [
+        {
+            "label": label, "x": float(x), "y": float(y), "exposure": exposure, "size": size,
+            "explanation": explanation, "lx": round(float(lx), 3), "ly": round(float(ly), 3), "moved": bool(m),
+        }
+        for label, x, y, exposure, size, explanation, lx, ly, m
+        in zip(labels, physical, transitional, exposures, sizes, explanations, label_x, label_y, moved)
+    ]
+
+    axis_expr = " : ".join(f"datum.value == {v} ? '{name}'" for v, name in AXIS_LABELS.items()) + " : ''"
+    scale = {"domain": [AXIS_MIN, AXIS_MAX], "nice": False}
+    x_axis = {"title": "Physical Risk", "values": list(AXIS_LABELS), "labelExpr": axis_expr, "grid": False}
+    y_axis = {"title": "Transitional Risk", "values": list(AXIS_LABELS), "labelExpr": axis_expr, "grid": False}
+
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": title,
+        "width": CHART_WIDTH,
+        "height": CHART_HEIGHT,
+        "data": {"values": values},
+        "layer": [
+            {
+                # Gradient background from green (low/low) to red (high/high)
+                "data": {"values": [{}]},
+                "mark": {
+                    "type": "rect", "x": 0, "y": 0, "x2": CHART_WIDTH, "y2": CHART_HEIGHT, "opacity": 0.5,
+                    "color": {
+                        "gradient": "linear", "x1": 0, "y1": 1, "x2": 1, "y2": 0,
+                        "stops": [{"offset": 0, "color": "green"}, {"offset": 0.5, "color": "yellow"}, {"offset": 1, "color": "red"}],
+                    },
+                },
+            },
+            {
+                # Leader lines for labels that had to move away from their point
+                "transform": [{"filter": "datum.moved"}],
+                "mark": {"type": "rule", "color": "black", "opacity": 0.4},
+                "encoding": {
+                    "x": {"field": "x", "type": "quantitative", "scale": scale, "axis": x_axis},
+                    "y": {"field": "y", "type": "quantitative", "scale": scale, "axis": y_axis},
+                    "x2": {"field": "lx"},
+                    "y2": {"field": "ly"},
+                },
+            },
+            {
+                "mark": {"type": "circle", "color": "black", "opacity": 1},
+                "encoding": {
+                    "x": {"field": "x", "type": "quantitative", "scale": scale, "axis": x_axis},
+                    "y": {"field": "y", "type": "quantitative", "scale": scale, "axis": y_axis},
+                    "size": {"field": "size", "type": "quantitative", "scale": None, "legend": None},
+                    "tooltip": [
+                        {"field": "label", "title": "Line"},
+                        {"field": "exposure", "title": "Exposure"},
+                        {"field": "x", "title": "Physical Risk Result"},
+                        {"field": "y", "title": "Transitional Risk Result"},
+                        {"field": "explanation", "title": "Explanation"},
+                    ],
+                },
+            },
+            {
+                "mark": {"type": "text", "fontSize": FONT_SIZE, "color": "black"},
+                "encoding": {
+                    "x": {"field": "lx", "type": "quantitative", "scale": scale},
+                    "y": {"field": "ly", "type": "quantitative", "scale": scale},
+                    "text": {"field": "label"},
+                },
+            },
+        ],
+    }
+
+
+def payload_size(spec):
+    # Size of the spec as sent to the browser, in bytes
+    return len(json.dumps(spec, separators=(",", ":")))
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+# Collision-avoiding placement of point labels on the heatmap.
+#
+# Greedy candidate placement: labels are placed one by one (largest markers
+# first), each at the first of a sequence of candidate positions around its
+# point - right, left, above, below and the diagonals, on rings of growing
+# radius - whose bounding box overlaps neither an already placed label nor a
+# marker. Placed boxes are kept in a uniform grid (spatial hash), so every
+# overlap test only looks at the boxes of neighbouring cells and the layout
+# stays close to linear in the number of labels. All geometry is in pixels;
+# results are converted back to data coordinates.
+
+# Candidate directions around a point, in order of preference
+_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+
+
+class _SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _keys(self, box):
+        x0, y0, x1, y1 = box
+        size = self.cell_size
+        for i in range(int(math.floor(x0 / size)), int(math.floor(x1 / size)) + 1):
+            for j in range(int(math.floor(y0 / size)), int(math.floor(y1 / size)) + 1):
+                yield (i, j)
+
+    def insert(self, box):
+        for key in self._keys(box):
+            self.cells.setdefault(key, []).append(box)
+
+    def collides(self, box):
+        x0, y0, x1, y1 = box
+        for key in self._keys(box):
+            for bx0, by0, bx1, by1 in self.cells.get(key, ()):
+                if x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1:
+                    return True
+        return False
+
+
+def place_labels(xs, ys, labels, x_domain, y_domain, width=600, height=450, font_size=11,
+                 marker_sizes=None, max_rings=8):
+    # Return label anchor positions (label_x, label_y) in data coordinates and
+    # whether each label was moved off its point (to draw a leader line)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    n = len(xs)
+    if n == 0:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+
+    x_scale = width / (x_domain[1] - x_domain[0])
+    y_scale = height / (y_domain[1] - y_domain[0])
+    px = (xs - x_domain[0]) * x_scale
+    py = (ys - y_domain[0]) * y_scale
+
+    # Marker radius in pixels from the Vega-Lite size (area in square pixels)
+    sizes = np.full(n, 100.0) if marker_sizes is None else np.asarray(marker_sizes, dtype=np.float64)
+    radii = np.sqrt(sizes / math.pi)
+
+    char_width = 0.6 * font_size
+    label_height = 1.2 * font_size
+    label_widths = np.array([len(str(label)) * char_width + 4 for label in labels])
+
+    grid = _SpatialHash(cell_size=max(label_widths.max(), label_height * 2))
+    # Markers are obstacles as well (identical markers only once)
+    for x, y, r in set(zip(px.round(1), py.round(1), radii.round(1))):
+        grid.insert((x - r, y - r, x + r, y + r))
+
+    label_x = np.empty(n)
+    label_y = np.empty(n)
+    moved = np.zeros(n, dtype=bool)
+    for i in np.argsort(-radii, kind="stable"):
+        w, h, r = label_widths[i], label_height, radii[i]
+        placed = None
+        for ring in range(max_rings):
+            gap = r + 3 + ring * label_height
+            for dx, dy in _DIRECTIONS:
+                # Box on the side of the point given by (dx, dy), gap pixels away
+                cx = px[i] + dx * (gap + w / 2)
+                cy = py[i] + dy * (gap + h / 2)
+                box = (cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2)
+                if box[0] < 0 or box[2] > width or box[1] < 0 or box[3] > height:
+                    continue
+                if not grid.collides(box):
+                    placed = (cx, cy, ring > 0)
+                    grid.insert(box)
+                    break
+            if placed:
+                break
+        if placed is None:
+            # No free spot within max_rings: fall back to the right of the point
+            placed = (px[i] + r + 3 + w / 2, py[i], False)
+        label_x[i] = placed[0] / x_scale + x_domain[0]
+        label_y[i] = placed[1] / y_scale + y_domain[0]
+        moved[i] = placed[2]
+    return label_x, label_y, moved
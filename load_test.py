@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from scoring_service import DEFAULT_HOST, DEFAULT_PORT
+from reference_data import asset_factor_table, lob_factor_table
+
+# Load test for scoring_service.py.
+#
+# Opens --concurrency keep-alive connections and sends POST /score requests
+# back to back for --duration seconds. Each request carries --batch random
+# exposure vectors, drawn from a pool of --distinct payloads, so the share of
+# requests answered from the service's response cache can be steered (a pool
+# of 1 measures the cached path, a large pool mostly the scoring path).
+# Reports throughput and latency percentiles. With --spawn the service is
+# started as a subprocess on the given port and stopped afterwards.
+
+LABELS = np.array(["Low", "Medium", "High", "Not relevant"], dtype=object)
+
+
+def build_requests(host, endpoint, batch, distinct, seed=0):
+    # Raw HTTP requests for the payload pool
+    n_lines = len(lob_factor_table() if endpoint == "lob" else asset_factor_table())
+    rng = np.random.default_rng(seed)
+    requests = []
+    for _ in range(distinct):
+        vectors = LABELS[rng.integers(0, len(LABELS), (batch, n_lines))].tolist()
+        body = json.dumps({"exposures": vectors}, separators=(",", ":")).encode()
+        requests.append(
+            f"POST /score/{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+    return requests
+
+
+async def client(host, port, requests, offset, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, requests, concurrency, duration):
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, requests, i, deadline, latencies, statuses) for i in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+async def wait_until_up(host, port, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the scoring service on localhost.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--endpoint", choices=["lob", "asset"], default="lob")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--batch", type=int, default=1, help="Exposure vectors per request")
+    parser.add_argument("--distinct", type=int, default=1000, help="Number of distinct request payloads")
+    parser.add_argument("--spawn", action="store_true", help="Start the service as a subprocess first")
+    args = parser.parse_args(argv)
+
+    requests = build_requests(args.host, args.endpoint, args.batch, args.distinct)
+    server = None
+    if args.spawn:
+        service = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_service.py")
+        server = subprocess.Popen([sys.executable, service, "--host", args.host, "--port", str(args.port)])
+    try:
+        asyncio.run(wait_until_up(args.host, args.port))
+        latencies, statuses, elapsed = asyncio.run(run_load(args.host, args.port, requests, args.concurrency, args.duration))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    n = len(latencies)
+    if not n:
+        print("No requests completed")
+        return 1
+    quantiles = statistics.quantiles(latencies, n=100) if n > 1 else latencies * 99
+    print(f"{n:,} requests in {elapsed:.1f}s: {n / elapsed:,.0f} requests/s, {n * args.batch / elapsed:,.0f} vectors/s")
+    print(f"latency p50 {quantiles[49] * 1000:.2f} ms, p90 {quantiles[89] * 1000:.2f} ms, p99 {quantiles[98] * 1000:.2f} ms")
+    print("status codes: " + ", ".join(f"{status}: {count:,}" for status, count in sorted(statuses.items())))
+    return 0 if set(statuses) == {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
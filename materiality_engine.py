@@ -0,0 +1,77 @@
+import numpy as np
+
+# Headless scoring engine for the ESG risk materiality methodology.
+#
+# The methodology combines the exposure band of a line of business (or asset
+# class) with its transition and physical risk factors:
+#
+#     Physical Risk Result     = (exposure score + Physical Risk Factor) / 2
+#     Transitional Risk Result = (exposure score + Transition Risk Factor) / 2
+#
+# where the exposure score is 1/2/3 for Low/Medium/High. Lines flagged as
+# "Not relevant/No exposure" have no result (NaN).
+#
+# Exposures are handled as small integer categorical codes rather than strings
+# so that whole batches of entities can be scored with NumPy broadcasting: an
+# exposure array of shape (n_entities, n_lines) is combined with factor arrays
+# of shape (n_lines,) in a single vectorised step.
+
+# Exposure bands offered in the questionnaire, in ascending order
+EXPOSURE_LEVELS = ["Low", "Medium", "High"]
+
+# Categorical codes: 0 = not relevant, 1 = Low, 2 = Medium, 3 = High
+NOT_RELEVANT = 0
+LOW, MEDIUM, HIGH = 1, 2, 3
+
+# Lookup table from categorical code to numeric exposure score
+_EXPOSURE_SCORES = np.array([np.nan, 1.0, 2.0, 3.0])
+
+
+def encode_exposure(labels):
+    # Map exposure labels ("Low", "Medium", "High", anything else) to
+    # categorical codes. Every label that is not an exposure band, e.g.
+    # "Not relevant/No exposure", is encoded as NOT_RELEVANT.
+    labels = np.asarray(labels, dtype=object)
+    codes = np.full(labels.shape, NOT_RELEVANT, dtype=np.int8)
+    for code, level in enumerate(EXPOSURE_LEVELS, start=1):
+        codes[labels == level] = code
+    return codes
+
+
+def unknown_exposure_labels(labels):
+    # Distinct labels that encode_exposure would score as not relevant but
+    # that are neither a "Not relevant..." label nor blank (None, NaN or ""),
+    # e.g. misspelt bands such as "medium" or "Hgh". Callers reject them
+    # rather than silently dropping the line.
+    labels = np.asarray(labels, dtype=object).ravel()
+    candidates = labels[encode_exposure(labels) == NOT_RELEVANT].tolist()
+    try:
+        distinct = list(dict.fromkeys(candidates))
+    except TypeError:  # unhashable labels, e.g. nested lists in JSON input
+        distinct = candidates
+    return [label for label in distinct if not _is_not_relevant_label(label)]
+
+
+def _is_not_relevant_label(label):
+    if label is None or (isinstance(label, float) and np.isnan(label)):
+        return True
+    return isinstance(label, str) and (label == "" or label.lower().startswith("not relevant"))
+
+
+def decode_exposure(codes, not_relevant_label="Not relevant/No exposure"):
+    # Inverse of encode_exposure, used when results are reported as labels
+    lookup = np.array([not_relevant_label] + EXPOSURE_LEVELS, dtype=object)
+    return lookup[np.asarray(codes, dtype=np.intp)]
+
+
+def score_materiality(exposure_codes, physical_factors, transition_factors):
+    # Score one or many entities at once.
+    #
+    # exposure_codes has shape (..., n_lines) and the factor arrays have shape
+    # (n_lines,), so a single entity (1-D) or a batch of entities (2-D) can be
+    # passed. Returns (physical_result, transitional_result) as float arrays
+    # with the same shape as exposure_codes; not relevant lines are NaN.
+    exposure = _EXPOSURE_SCORES[np.asarray(exposure_codes, dtype=np.intp)]
+    physical = (exposure + np.asarray(physical_factors, dtype=np.float64)) / 2
+    transitional = (exposure + np.asarray(transition_factors, dtype=np.float64)) / 2
+    return physical, transitional
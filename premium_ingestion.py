@@ -0,0 +1,134 @@
+import argparse
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from reference_data import lob_factor_table
+from streaming_io import CHUNK_SIZE, build_index, exposure_bands, iter_chunks, lookup_codes
+
+# Out-of-core aggregation of policy- or contract-level premium data.
+#
+# A premium file has one row per policy or contract with (at least) the columns
+#
+#     Line of Business,Net Premium
+#
+# "Line of Business" is the Solvency II Short Name code (MED, WC, MTPL, FIRE,
+# ...) or the full name of a line of business of the risk-factor table. The
+# file is streamed in chunks and folded into one accumulator per line of
+# business, so memory stays bounded for multi-GB portfolios. The net premium
+# share of every line of business gives its exposure band with the legend
+# thresholds of the questionnaire.
+
+LOB_COLUMN = "Line of Business"
+PREMIUM_COLUMN = "Net Premium"
+
+
+@dataclass(frozen=True)
+class PremiumSummary:
+    lines_of_business: tuple
+    short_names: tuple
+    net_premiums: np.ndarray   # (n_lines_of_business,)
+    unmapped_premium: float    # net premium of rows with an unknown line of business
+    rows: int
+    bytes_read: int
+    elapsed: float
+
+    @property
+    def total_premium(self):
+        return float(self.net_premiums.sum())
+
+    @property
+    def shares(self):
+        # Share of each line of business in the total net premium
+        total = self.total_premium
+        return self.net_premiums / total if total > 0 else np.zeros_like(self.net_premiums)
+
+    @property
+    def bands(self):
+        return exposure_bands(self.shares, not_relevant_label="Not relevant/No exposure")
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes_read / 1e6 / self.elapsed if self.elapsed else float("inf")
+
+    def to_frame(self):
+        return pd.DataFrame({
+            "Lines of Business": self.lines_of_business,
+            "Short Name": self.short_names,
+            "Net Premium": self.net_premiums,
+            "Share of Total Net Premium": self.shares,
+            "Exposure": self.bands,
+        })
+
+
+def _source_size(source):
+    # Size of a path or seekable file-like object in bytes (0 if unknown)
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    size = getattr(source, "size", None)
+    if size is not None:
+        return size
+    try:
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return 0
+
+
+def ingest_premiums(source, chunk_size=CHUNK_SIZE, file_name=None):
+    # Stream a premium CSV/Parquet file (path or file-like object) and
+    # aggregate the net premium by Solvency II line of business
+    start = time.perf_counter()
+    table = lob_factor_table()
+    lob_index = build_index(zip(table.names, table.short_names))
+
+    net_premiums = np.zeros(len(table))
+    unmapped_premium = 0.0
+    rows = 0
+
+    for chunk in iter_chunks(source, [LOB_COLUMN, PREMIUM_COLUMN], chunk_size, [LOB_COLUMN], file_name):
+        for required in (LOB_COLUMN, PREMIUM_COLUMN):
+            if required not in chunk.columns:
+                raise ValueError(f"Premium file is missing the {required!r} column")
+        rows += len(chunk)
+        premium = pd.to_numeric(chunk[PREMIUM_COLUMN], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+        lob = lookup_codes(chunk[LOB_COLUMN], lob_index, -1)
+
+        mapped = lob >= 0
+        unmapped_premium += float(premium[~mapped].sum())
+        net_premiums += np.bincount(lob[mapped], weights=premium[mapped], minlength=len(table))
+
+    return PremiumSummary(
+        lines_of_business=tuple(table.names),
+        short_names=tuple(table.short_names),
+        net_premiums=net_premiums,
+        unmapped_premium=unmapped_premium,
+        rows=rows,
+        bytes_read=_source_size(source),
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive line of business exposure bands from policy-level premium data.")
+    parser.add_argument("premiums", help="Premium CSV or Parquet file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per chunk")
+    args = parser.parse_args(argv)
+
+    summary = ingest_premiums(args.premiums, chunk_size=args.chunk_size)
+    print(summary.to_frame().to_string(index=False))
+    print(f"\n{summary.rows:,} rows in {summary.elapsed:.2f}s ({summary.rows_per_second:,.0f} rows/s, "
+          f"{summary.megabytes_per_second:,.1f} MB/s); unmapped net premium {summary.unmapped_premium:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import cProfile
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Optional per-rerun instrumentation of the Streamlit pages.
+#
+# Set ESG_PROFILE=1 to enable it. Every full rerun is then run under cProfile
+# and its profile is dumped to ESG_PROFILE_DIR (default: profiles/) for
+# inspection with pstats or snakeviz; the sections wrapped in timed() are
+# collected and shown in a timing panel in the sidebar. Fragment reruns do not
+# go through the main script, so fragments wrapped in profile_fragment() are
+# profiled on their own when they rerun alone. When disabled, the hooks reduce
+# to a flag check.
+#
+# Startup is measured in every process, enabled or not: the first import of
+# each page module (import_page) and the first complete render of each page
+# (first_paint), with the time elapsed since the process started. These are
+# recorded once per page and process, so the cost is a dictionary lookup.
+
+PROFILE_ENABLED = os.environ.get("ESG_PROFILE", "") not in ("", "0")
+PROFILE_DIR = os.environ.get("ESG_PROFILE_DIR", "profiles")
+
+_local = threading.local()
+
+
+def _process_start_time():
+    # Wall-clock start of this process from /proc (Linux); elsewhere the time
+    # this module was imported, which comes shortly after
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+PROCESS_START = _process_start_time()
+
+_page_imports = {}  # module name -> seconds of its first import
+_first_paints = {}  # page -> (seconds of its first render, seconds since process start)
+
+
+class RerunTimings:
+    def __init__(self, page):
+        self.page = page
+        self.sections = []  # (label, seconds) in completion order
+        self.total = 0.0
+        self.profile_path = None
+
+
+@contextmanager
+def timed(label):
+    # Record the duration of a block in the timings of the current rerun
+    timings = getattr(_local, "timings", None) if PROFILE_ENABLED else None
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.sections.append((label, time.perf_counter() - start))
+
+
+@contextmanager
+def profile_rerun(page):
+    # Profile one rerun of page; yields its RerunTimings (None when disabled)
+    if not PROFILE_ENABLED:
+        yield None
+        return
+    timings = RerunTimings(page)
+    _local.timings = timings
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield timings
+    finally:
+        profiler.disable()
+        timings.total = time.perf_counter() - start
+        _local.timings = None
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_page = "".join(c if c.isalnum() else "_" for c in page)
+        timings.profile_path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{safe_page}.prof")
+        profiler.dump_stats(timings.profile_path)
+
+
+def profile_fragment(label, show_timings=None):
+    # Decorator for st.fragment functions, applied below @st.fragment. Within
+    # a full rerun the fragment is a timed() section of it; a fragment rerun
+    # is profiled like a full rerun and show_timings(timings) is called at
+    # its end
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_ENABLED:
+                return func(*args, **kwargs)
+            if getattr(_local, "timings", None) is not None:
+                with timed(label):
+                    return func(*args, **kwargs)
+            with profile_rerun(label) as timings:
+                result = func(*args, **kwargs)
+            if show_timings is not None:
+                show_timings(timings)
+            return result
+        return wrapper
+    return decorator
+
+
+def import_page(module_name):
+    # Import a page module on first use, recording how long the import took
+    # (including the libraries it pulls in for the first time)
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _page_imports.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+@contextmanager
+def first_paint(page):
+    # Record the first complete render of page in this process
+    if page in _first_paints:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    _first_paints.setdefault(page, (time.perf_counter() - start, time.time() - PROCESS_START))
+
+
+def startup_report(page_modules):
+    # Rows of (page, first import seconds, first render seconds, seconds from
+    # process start to the end of the first render) for the pages seen so far
+    return [
+        (page, _page_imports.get(page_modules.get(page)), render, since_start)
+        for page, (render, since_start) in _first_paints.items()
+    ]
@@ -0,0 +1,134 @@
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+# Reference data for the materiality methodology: the risk-factor tables for
+# the Solvency II lines of business (section 1) and the asset classes
+# (section 2.1). Kept free of Streamlit so it can be used by headless tools.
+#
+# The tables live in versioned CSV files under data/ and are parsed once per
+# process. Every load checks the file's modification time and size; when those
+# change the file is re-hashed and only re-parsed if its content hash differs,
+# so an edited factor file is picked up on the next Streamlit rerun without
+# restarting the server.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Current versions of the risk-factor files
+LOB_FACTORS_FILE = os.path.join(DATA_DIR, "lob_risk_factors_v1.csv")
+ASSET_FACTORS_FILE = os.path.join(DATA_DIR, "asset_risk_factors_v1.csv")
+
+
+@dataclass(frozen=True)
+class RiskFactorTable:
+    # Read-only view of a parsed risk-factor file. The column arrays are
+    # flagged non-writeable, so the cached instance can be shared by every
+    # caller without a defensive copy.
+    path: str
+    version: str
+    sha256: str
+    name_column: str
+    short_name_column: str
+    columns: Mapping[str, np.ndarray]
+
+    @property
+    def names(self) -> np.ndarray:
+        return self.columns[self.name_column]
+
+    @property
+    def short_names(self) -> np.ndarray:
+        return self.columns[self.short_name_column]
+
+    @property
+    def transition_factors(self) -> np.ndarray:
+        return self.columns["Transition Risk Factor"]
+
+    @property
+    def physical_factors(self) -> np.ndarray:
+        return self.columns["Physical Risk Factor"]
+
+    @property
+    def explanations(self) -> np.ndarray:
+        return self.columns["Explanation"]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_frame(self) -> pd.DataFrame:
+        # New, mutable DataFrame for callers that add their own columns
+        return pd.DataFrame({name: np.array(values) for name, values in self.columns.items()})
+
+
+# path -> (mtime_ns, size, RiskFactorTable)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _file_version(path):
+    # "lob_risk_factors_v1.csv" -> "v1"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.rsplit("_", 1)[-1] if "_v" in stem else "unversioned"
+
+
+def _parse_table(path, content, digest, name_column, short_name_column):
+    df = pd.read_csv(io.BytesIO(content))
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy(dtype=np.int8 if column.endswith("Risk Factor") else None, copy=True)
+        values.flags.writeable = False
+        columns[column] = values
+    return RiskFactorTable(
+        path=path,
+        version=f"{_file_version(path)}-{digest[:12]}",
+        sha256=digest,
+        name_column=name_column,
+        short_name_column=short_name_column,
+        columns=MappingProxyType(columns),
+    )
+
+
+def load_factor_table(path, name_column, short_name_column):
+    # Return the cached RiskFactorTable for path, re-parsing only when the
+    # file content hash has changed
+    stat = os.stat(path)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached is not None and cached[2].sha256 == digest:
+            table = cached[2]
+        else:
+            table = _parse_table(path, content, digest, name_column, short_name_column)
+        _cache[path] = (stat.st_mtime_ns, stat.st_size, table)
+        return table
+
+
+def lob_factor_table():
+    # Lines of business with transition and physical risk factors (1 = low, 3 = high)
+    return load_factor_table(LOB_FACTORS_FILE, "Lines of Business", "Short Name")
+
+
+def asset_factor_table():
+    # Asset classes with transition and physical risk factors (1 = low, 3 = high)
+    return load_factor_table(ASSET_FACTORS_FILE, "Asset Class", "Short Name Asset")
+
+
+def load_lob_factors():
+    # Lines of business risk-factor table as a new DataFrame
+    return lob_factor_table().to_frame()
+
+
+def load_asset_factors():
+    # Asset class risk-factor table as a new DataFrame
+    return asset_factor_table().to_frame()
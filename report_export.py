@@ -0,0 +1,145 @@
+import argparse
+import importlib.util
+import os
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")  # Non-interactive backend: reports are rendered headless
+
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from batch_assessment import entity_file_names
+from heatmap_rendering import draw_heatmap, heatmap_points, render_heatmap_png
+
+# Report pack export for one or many entities.
+#
+# Input is the consolidated results table of the batch runner
+# (batch_assessment.py). For every entity the pipeline writes
+#   - PNG heatmaps of its insurance and investment activities,
+#   - a PDF with both heatmaps followed by the results table and explanations,
+#   - an Excel workbook with the results table,
+# and a group workbook with the results of all entities. Entities are split
+# into chunks that are rendered by a pool of worker processes. The Excel
+# workbooks need openpyxl; without it the export stops before rendering.
+
+FORMATS = ("png", "pdf", "xlsx")
+
+# Name of the group workbook next to the per-entity reports
+GROUP_REPORT = "group_report"
+
+HEATMAP_TITLES = {
+    "Insurance": "Insurance Lines of Business Heatmap",
+    "Investment": "Investment Classes Heatmap",
+}
+
+# Lines of text per PDF results page
+PDF_LINES_PER_PAGE = 55
+
+
+def _points(results, activity):
+    rows = results[results["Activity"] == activity]
+    return heatmap_points(rows["Short Name"], rows["Physical Risk Result"], rows["Transitional Risk Result"], rows["Exposure Materiality"])
+
+
+def _results_text(entity, results):
+    # Results table with explanations as wrapped text lines
+    lines = [f"Risk Factor Table - {entity}", ""]
+    for _, row in results.iterrows():
+        lines.append(
+            f"{row['Line']} ({row['Short Name']}): exposure {row['Exposure Materiality']}, "
+            f"physical {row['Physical Risk Result']:.1f}, transitional {row['Transitional Risk Result']:.1f}"
+        )
+        lines.extend("    " + part for part in textwrap.wrap(str(row["Explanation"]), 110))
+    return lines
+
+
+def _write_pdf(path, entity, results):
+    with PdfPages(path) as pdf:
+        fig = Figure(figsize=(11.69, 8.27))  # A4 landscape
+        FigureCanvasAgg(fig)
+        fig.suptitle(f"ESG Risk Materiality Assessment - {entity}")
+        for position, (activity, title) in enumerate(HEATMAP_TITLES.items(), start=1):
+            draw_heatmap(fig.add_subplot(1, 2, position), _points(results, activity), title)
+        fig.tight_layout()
+        pdf.savefig(fig)
+
+        text = _results_text(entity, results)
+        for start in range(0, len(text), PDF_LINES_PER_PAGE):
+            fig = Figure(figsize=(11.69, 8.27))
+            FigureCanvasAgg(fig)
+            fig.text(0.03, 0.97, "\n".join(text[start:start + PDF_LINES_PER_PAGE]), va="top", ha="left",
+                     family="monospace", fontsize=7)
+            pdf.savefig(fig)
+
+
+def render_entities(entity_results, output_dir, formats):
+    # Worker: write the report files of a chunk of entities
+    written = 0
+    for entity, file_name, results in entity_results:
+        base = os.path.join(output_dir, file_name)
+        if "png" in formats:
+            for activity, title in HEATMAP_TITLES.items():
+                png = render_heatmap_png(_points(results, activity), f"{title} - {entity}", dpi=150, cache=None)
+                with open(f"{base}_{activity.lower()}_heatmap.png", "wb") as f:
+                    f.write(png)
+                written += 1
+        if "pdf" in formats:
+            _write_pdf(f"{base}.pdf", entity, results)
+            written += 1
+        if "xlsx" in formats:
+            results.to_excel(f"{base}.xlsx", sheet_name="Results", index=False)
+            written += 1
+    return written
+
+
+def export_reports(results, output_dir, formats=FORMATS, workers=None, chunk_size=None):
+    # Render the report pack of every entity in results; returns the number of files written
+    if "xlsx" in formats and importlib.util.find_spec("openpyxl") is None:
+        raise ImportError("Excel export needs openpyxl: pip install openpyxl, or pass --formats png pdf")
+    os.makedirs(output_dir, exist_ok=True)
+    groups = list(results.groupby("Entity", sort=False))
+    file_names = entity_file_names([entity for entity, _ in groups], reserved=[GROUP_REPORT])
+    entity_results = [(entity, file_name, rows) for (entity, rows), file_name in zip(groups, file_names)]
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-len(entity_results) // (workers * 4)))
+    chunks = [entity_results[i:i + chunk_size] for i in range(0, len(entity_results), chunk_size)]
+
+    if workers == 1:
+        written = sum(render_entities(chunk, output_dir, formats) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(render_entities, chunks, [output_dir] * len(chunks), [formats] * len(chunks)))
+
+    if "xlsx" in formats:
+        results.to_excel(os.path.join(output_dir, f"{GROUP_REPORT}.xlsx"), sheet_name="Results", index=False)
+        written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export heatmaps and results tables of many entities to PNG, PDF and Excel.")
+    parser.add_argument("results", help="Consolidated results CSV written by batch_assessment.py")
+    parser.add_argument("-o", "--output-dir", default="materiality_reports", help="Directory for the report files")
+    parser.add_argument("-f", "--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="Report formats")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = pd.read_csv(args.results)
+    try:
+        written = export_reports(results, args.output_dir, formats=tuple(args.formats), workers=args.workers)
+    except ImportError as exc:
+        parser.exit(1, f"{exc}\n")
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {written} files for {results['Entity'].nunique()} entities in {elapsed:.1f}s -> {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+
+import numpy as np
+
+from materiality_engine import EXPOSURE_LEVELS, NOT_RELEVANT, encode_exposure, score_materiality, unknown_exposure_labels
+from reference_data import asset_factor_table, lob_factor_table
+
+# HTTP scoring service for other risk systems (capital model, data warehouse).
+#
+# A small asyncio HTTP/1.1 server (standard library only) exposing the
+# scoring methodology of the questionnaires:
+#
+#     GET  /health
+#     GET  /reference/{lob,asset}   lines, short names, factors and version
+#     POST /score/{lob,asset}       {"exposures": [vector, ...]}
+#
+# Every exposure vector is either a list of labels in the order of the
+# reference table or an object {line or short name: label}. Labels are
+# Low/Medium/High; lines that are missing, null, "" or labelled "Not
+# relevant..." are not relevant, and any other label is rejected. The
+# response holds the physical and transitional results per vector (null where
+# not relevant), scored in one vectorised step per request.
+#
+# The reference tables are loaded once at startup. Responses are cached by
+# table and encoded exposure codes, so requests with the same inputs are
+# answered from memory whatever their JSON formatting; the hash of the request
+# body is kept as an alias of that key, so byte-identical requests skip
+# parsing. The cache is bounded by the total size of the responses it holds,
+# and responses of large batches are not cached at all. Connections are kept
+# alive, so clients sending many requests pay the TCP handshake once.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH = 100_000
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MAX_ENTRIES = 4096
+# Responses above this size (about 11,000 LoB vectors) are not cached
+CACHE_MAX_ITEM_BYTES = 1024 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    # Thread-safe LRU cache of encoded response bodies bounded by entry count
+    # and by the total number of bytes held. Aliases map another key (the
+    # request body hash) to a cached entry without storing the body twice
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES, max_item_bytes=CACHE_MAX_ITEM_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_item_bytes = max_item_bytes
+        self._entries = OrderedDict()
+        self._aliases = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            key = self._aliases.get(key, key)
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body, alias=None):
+        # Store body under key (and alias); bodies above max_item_bytes are
+        # not cached
+        if len(body) > self.max_item_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = body
+            self._size += len(body)
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+            if alias is not None and key in self._entries:
+                self._add_alias(alias, key)
+
+    def _add_alias(self, alias, key):
+        # Aliases of evicted entries just miss; their number is bounded too
+        self._aliases[alias] = key
+        self._aliases.move_to_end(alias)
+        while len(self._aliases) > self.max_entries:
+            self._aliases.popitem(last=False)
+
+    def alias(self, alias, key):
+        # Make a cached entry reachable under another key as well
+        with self._lock:
+            if key in self._entries:
+                self._add_alias(alias, key)
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ScoringService:
+    def __init__(self, cache=None):
+        self.tables = {"lob": lob_factor_table(), "asset": asset_factor_table()}
+        self._positions = {
+            name: {str(key).strip().casefold(): position
+                   for position, keys in enumerate(zip(table.names, table.short_names)) for key in keys}
+            for name, table in self.tables.items()
+        }
+        self._reference = {
+            name: _json_bytes({
+                "version": table.version,
+                "lines": list(table.names),
+                "short_names": list(table.short_names),
+                "physical_factors": table.physical_factors.tolist(),
+                "transition_factors": table.transition_factors.tolist(),
+            })
+            for name, table in self.tables.items()
+        }
+        self.cache = ResponseCache() if cache is None else cache
+
+    def encode(self, name, vectors):
+        # (n_vectors, n_lines) exposure codes from the request vectors; the
+        # labels of all vectors are encoded in one vectorised call
+        table = self.tables[name]
+        positions = self._positions[name]
+        codes = np.full((len(vectors), len(table)), NOT_RELEVANT, dtype=np.int8)
+        list_rows, dict_rows, dict_columns, dict_labels = [], [], [], []
+        for row, vector in enumerate(vectors):
+            if isinstance(vector, list):
+                if len(vector) != len(table):
+                    raise HttpError(HTTPStatus.BAD_REQUEST, f"Exposure vector {row} has {len(vector)} entries, expected {len(table)}")
+                list_rows.append(row)
+            elif isinstance(vector, dict):
+                for line, label in vector.items():
+                    position = positions.get(str(line).strip().casefold())
+                    if position is None:
+                        raise HttpError(HTTPStatus.BAD_REQUEST, f"Unknown line {line!r} in exposure vector {row}")
+                    dict_rows.append(row)
+                    dict_columns.append(position)
+                    dict_labels.append(label)
+            else:
+                raise HttpError(HTTPStatus.BAD_REQUEST, f"Exposure vector {row} must be a list or an object")
+        unknown = []
+        if list_rows:
+            labels = np.empty((len(list_rows), len(table)), dtype=object)
+            labels[:] = [vectors[row] for row in list_rows]
+            codes[list_rows] = encode_exposure(labels)
+            unknown += unknown_exposure_labels(labels)
+        if dict_rows:
+            labels = np.empty(len(dict_labels), dtype=object)
+            labels[:] = dict_labels
+            codes[dict_rows, dict_columns] = encode_exposure(labels)
+            unknown += unknown_exposure_labels(labels)
+        if unknown:
+            listed = ", ".join(json.dumps(label) for label in unknown[:20]) + (", ..." if len(unknown) > 20 else "")
+            raise HttpError(HTTPStatus.BAD_REQUEST,
+                            f"Unknown exposure labels: {listed} (expected {', '.join(EXPOSURE_LEVELS)} or Not relevant)")
+        return codes
+
+    def score(self, name, body):
+        # Response body for POST /score/{name}. Byte-identical requests are
+        # answered without parsing; otherwise the cache key is the encoded
+        # exposure codes
+        body_key = (name, hashlib.blake2b(body, digest_size=16).digest())
+        cached = self.cache.get(body_key)
+        if cached is not None:
+            return cached
+        try:
+            request = json.loads(body)
+        except ValueError as exc:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {exc}")
+        vectors = request.get("exposures") if isinstance(request, dict) else None
+        if not isinstance(vectors, list):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Expected an object with an "exposures" list')
+        if len(vectors) > MAX_BATCH:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {MAX_BATCH} exposure vectors per request")
+
+        codes = self.encode(name, vectors)
+        key = (name, codes.shape, hashlib.blake2b(codes.tobytes(), digest_size=16).digest())
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.alias(body_key, key)
+            return cached
+
+        table = self.tables[name]
+        physical, transitional = score_materiality(codes, table.physical_factors, table.transition_factors)
+        response = _json_bytes({
+            "version": table.version,
+            "short_names": list(table.short_names),
+            "physical": _nullable(physical),
+            "transitional": _nullable(transitional),
+        })
+        self.cache.put(key, response, alias=body_key)
+        return response
+
+    def handle(self, method, path, body):
+        # (status, response body) for one request
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts == ["health"]:
+            _require(method, "GET")
+            return HTTPStatus.OK, _json_bytes({"status": "ok", "cache_entries": len(self.cache), "cache_bytes": self.cache.size_bytes,
+                                               "cache_hits": self.cache.hits, "cache_misses": self.cache.misses})
+        if len(parts) == 2 and parts[1] in self.tables:
+            if parts[0] == "reference":
+                _require(method, "GET")
+                return HTTPStatus.OK, self._reference[parts[1]]
+            if parts[0] == "score":
+                _require(method, "POST")
+                return HTTPStatus.OK, self.score(parts[1], body)
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY_BYTES:
+                        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    status, response = self.handle(method, path, body)
+                except HttpError as exc:
+                    status, response = exc.status, _json_bytes({"error": str(exc)})
+                    keep_alive = keep_alive and exc.status != HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                except asyncio.IncompleteReadError:
+                    return
+                except ValueError as exc:
+                    status, response = HTTPStatus.BAD_REQUEST, _json_bytes({"error": str(exc)})
+
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(response)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+
+def _require(method, expected):
+    if method != expected:
+        raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {expected}")
+
+
+def _nullable(results):
+    # Nested lists with null for not relevant lines
+    return np.where(np.isnan(results), None, results).tolist()
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None):
+    service = service or ScoringService()
+    server = await asyncio.start_server(service.serve_connection, host, port, backlog=1024)
+    print(f"Scoring service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service scoring exposure vectors with the materiality methodology.")
+    parser.add_argument("--host", default=os.environ.get("ESG_SERVICE_HOST", DEFAULT_HOST), help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("ESG_SERVICE_PORT", DEFAULT_PORT)), help="Port to listen on")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+
+from materiality_engine import NOT_RELEVANT, encode_exposure
+
+# Sectoral and regional breakdown of investment activities (section 2.2).
+#
+# For every relevant asset class the materiality of its exposure to each
+# Climate Policy Relevant Sector (CPRS) is assessed per region. The answers
+# form a dense tensor of categorical codes with shape
+#
+#     (..., n_asset_classes, n_categories, n_regions)
+#
+# (leading axes for batches of entities) that is reduced with vectorised
+# maxima. The CPRS factor of an asset class is its highest sectoral
+# materiality over all categories and regions; it replaces the generic
+# transition risk factor of the asset class to give a sector-informed
+# transitional risk result on the usual 1-3 scale.
+
+CPRS_CATEGORIES = ["Fossil Fuel", "Utility/Electricity", "Energy Intensive", "Buildings", "Transportation", "Agriculture"]
+REGIONS = ["Europe", "North America", "Asia-Pacific", "Rest of World"]
+
+
+def build_materiality_tensor(labels):
+    # Encode a nested array-like of materiality labels with shape
+    # (..., n_asset_classes, n_categories, n_regions) into int8 codes
+    return encode_exposure(labels)
+
+
+def cprs_factors(tensor):
+    # Highest sectoral materiality per asset class over categories and regions;
+    # NOT_RELEVANT (0) when an asset class has no CPRS exposure at all
+    return tensor.max(axis=(-2, -1))
+
+
+def dominant_breakdown(tensor):
+    # Index of the category and of the region of the (category, region) cell
+    # carrying the highest materiality per asset class (first cell in
+    # category-major order on ties), so the pair is always a maximal cell
+    tensor = np.asarray(tensor)
+    cells = tensor.reshape(*tensor.shape[:-2], -1).argmax(axis=-1)
+    return np.unravel_index(cells, tensor.shape[-2:])
+
+
+def sectoral_transitional_result(exposure_codes, tensor):
+    # Combine the exposure of each asset class with its CPRS factor:
+    # (exposure score + CPRS factor) / 2, NaN when either is not relevant
+    exposure = np.asarray(exposure_codes, dtype=np.float64)
+    factor = cprs_factors(tensor).astype(np.float64)
+    relevant = (exposure != NOT_RELEVANT) & (factor != NOT_RELEVANT)
+    return np.where(relevant, (exposure + factor) / 2, np.nan)
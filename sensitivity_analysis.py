@@ -0,0 +1,163 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from materiality_engine import EXPOSURE_LEVELS, HIGH, LOW, MEDIUM, NOT_RELEVANT, score_materiality
+from scenario_engine import MATERIALITY_THRESHOLD
+
+# Exhaustive what-if sensitivity analysis over exposure combinations.
+#
+# Every questionnaire state is an assignment of one exposure code per line.
+# The states of a (sub)space, given by the allowed codes per line, are
+# enumerated by decoding a range of integers in mixed radix, chunk by chunk,
+# and scored with the vectorised engine. Per state the outcome is the heatmap
+# cell of the average physical and transitional result over the relevant
+# lines (results lie on the 1, 1.5, ..., 3 grid, giving 5 x 5 cells). Across
+# all states the analysis accumulates
+#   - the distribution of outcome cells and of the number of material lines,
+#   - per cell, the average exposure score of every line, which shows the
+#     lines that drive a cell compared with their overall average.
+# Memory is bounded by the chunk size, independent of the size of the space.
+
+CHUNK_STATES = 1 << 16
+ALL_CODES = (NOT_RELEVANT, LOW, MEDIUM, HIGH)
+
+# Positions of the heatmap grid (results are multiples of 0.5 between 1 and 3)
+GRID = np.arange(1.0, 3.01, 0.5)
+N_CELLS = len(GRID) * len(GRID)
+NO_EXPOSURE_CELL = N_CELLS  # states without any relevant line
+
+CODE_LABELS = {NOT_RELEVANT: "Not relevant", LOW: "Low", MEDIUM: "Medium", HIGH: "High"}
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    labels: tuple
+    n_states: int
+    cell_counts: np.ndarray       # (N_CELLS + 1,) states per outcome cell
+    driver_sums: np.ndarray       # (N_CELLS + 1, n_lines) sum of exposure scores per cell
+    material_counts: np.ndarray   # (n_lines + 1,) states per number of material lines
+    overall_mean_scores: np.ndarray  # (n_lines,) average exposure score per line
+    elapsed: float
+
+    def cell_distribution(self):
+        # Share of states per heatmap cell as a grid (rows: transitional, columns: physical)
+        shares = self.cell_counts[:N_CELLS].reshape(len(GRID), len(GRID)) / max(self.n_states, 1)
+        names = [f"{value:g}" for value in GRID]
+        return pd.DataFrame(shares.T[::-1], index=names[::-1], columns=names).rename_axis(index="Transitional \\ Physical")
+
+    def drivers(self, top=5):
+        # Lines whose exposure score in the most frequent cells deviates most
+        # from their average over all states
+        rows = []
+        for cell in np.argsort(self.cell_counts[:N_CELLS])[::-1][:top]:
+            count = self.cell_counts[cell]
+            if count == 0:
+                break
+            lift = self.driver_sums[cell] / count - self.overall_mean_scores
+            order = np.argsort(np.abs(lift))[::-1][:3]
+            physical, transitional = GRID[cell // len(GRID)], GRID[cell % len(GRID)]
+            rows.append({
+                "Cell (Physical, Transitional)": f"({physical:g}, {transitional:g})",
+                "Share of States": count / self.n_states,
+                "Main Drivers": ", ".join(f"{self.labels[j]} ({lift[j]:+.2f})" for j in order if abs(lift[j]) > 0.005) or "-",
+            })
+        return pd.DataFrame(rows)
+
+    def material_distribution(self):
+        return pd.DataFrame({
+            "Material Lines": np.arange(len(self.material_counts)),
+            "Share of States": self.material_counts / max(self.n_states, 1),
+        })
+
+
+def decode_states(start, stop, choices):
+    # Exposure codes of states start..stop-1 of the space spanned by choices
+    # (one array of allowed codes per line), as an int8 (n_states, n_lines) array
+    index = np.arange(start, stop, dtype=np.int64)
+    codes = np.empty((stop - start, len(choices)), dtype=np.int8)
+    for j, allowed in enumerate(choices):
+        index, digit = np.divmod(index, len(allowed))
+        codes[:, j] = allowed[digit]
+    return codes
+
+
+def outcome_cells(physical, transitional):
+    # Heatmap cell of the average result over the relevant lines per state
+    relevant = ~np.isnan(physical)
+    count = relevant.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_physical = np.where(relevant, physical, 0.0).sum(axis=1) / count
+        mean_transitional = np.where(relevant, transitional, 0.0).sum(axis=1) / count
+    # Snap to the nearest grid position
+    px = np.clip(np.rint((mean_physical - 1.0) * 2), 0, len(GRID) - 1)
+    ty = np.clip(np.rint((mean_transitional - 1.0) * 2), 0, len(GRID) - 1)
+    cells = np.where(count > 0, px * len(GRID) + ty, NO_EXPOSURE_CELL)
+    return cells.astype(np.intp)
+
+
+def analyse(labels, physical_factors, transition_factors, choices=None, chunk_states=CHUNK_STATES):
+    # Evaluate every state of the space given by choices (default: all four
+    # exposure choices for every line)
+    start_time = time.perf_counter()
+    n_lines = len(labels)
+    choices = [np.asarray(ALL_CODES if c is None else c, dtype=np.int8) for c in (choices or [None] * n_lines)]
+    n_states = int(np.prod([len(c) for c in choices], dtype=np.int64))
+
+    cell_counts = np.zeros(N_CELLS + 1, dtype=np.int64)
+    driver_sums = np.zeros((N_CELLS + 1, n_lines))
+    material_counts = np.zeros(n_lines + 1, dtype=np.int64)
+    score_sums = np.zeros(n_lines)
+
+    for start in range(0, n_states, chunk_states):
+        codes = decode_states(start, min(start + chunk_states, n_states), choices)
+        physical, transitional = score_materiality(codes, physical_factors, transition_factors)
+        cells = outcome_cells(physical, transitional)
+
+        cell_counts += np.bincount(cells, minlength=N_CELLS + 1)
+        for j in range(n_lines):
+            driver_sums[:, j] += np.bincount(cells, weights=codes[:, j], minlength=N_CELLS + 1)
+        score_sums += codes.sum(axis=0)
+
+        material = (np.nan_to_num(physical) >= MATERIALITY_THRESHOLD) | (np.nan_to_num(transitional) >= MATERIALITY_THRESHOLD)
+        material_counts += np.bincount(material.sum(axis=1), minlength=n_lines + 1)
+
+    return SensitivityResult(
+        labels=tuple(labels),
+        n_states=n_states,
+        cell_counts=cell_counts,
+        driver_sums=driver_sums,
+        material_counts=material_counts,
+        overall_mean_scores=score_sums / max(n_states, 1),
+        elapsed=time.perf_counter() - start_time,
+    )
+
+
+def stability(codes, physical_factors, transition_factors):
+    # Share of single-line changes of the given state (every other exposure
+    # choice of one line) that keep its outcome cell, and the lines whose
+    # change moves the outcome
+    codes = np.asarray(codes, dtype=np.int8)
+    neighbours = [codes]
+    changed_line = [-1]
+    for j in range(len(codes)):
+        for code in ALL_CODES:
+            if code != codes[j]:
+                neighbour = codes.copy()
+                neighbour[j] = code
+                neighbours.append(neighbour)
+                changed_line.append(j)
+    physical, transitional = score_materiality(np.stack(neighbours), physical_factors, transition_factors)
+    cells = outcome_cells(physical, transitional)
+    moved = cells[1:] != cells[0]
+    sensitive_lines = sorted(set(np.asarray(changed_line[1:])[moved].tolist()))
+    return 1.0 - moved.mean(), sensitive_lines
+
+
+def parse_choices(selected_labels):
+    # Allowed codes per line from lists of exposure labels ("Low", ...,
+    # anything else meaning not relevant)
+    lookup = {level: code for code, level in enumerate(EXPOSURE_LEVELS, start=1)}
+    return [np.array(sorted({lookup.get(label, NOT_RELEVANT) for label in labels}), dtype=np.int8) for labels in selected_labels]
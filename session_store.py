@@ -0,0 +1,189 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Bounded per-session store for assessment inputs and computed results.
+#
+# Every browser session gets its own key/value namespace. The store enforces
+#   - a memory cap per session: the least recently written values of a session
+#     are dropped when the session grows beyond the cap,
+#   - a TTL: sessions idle for longer than ttl_seconds are removed,
+#   - a bound on the number of sessions and the total bytes held in memory:
+#     the least recently used sessions are evicted (or spilled to disk).
+# All operations hold a lock, so concurrent reruns of the same or different
+# sessions are safe. With a spill directory, evicted sessions are pickled to
+# local disk and restored transparently on their next access.
+
+DEFAULT_MAX_SESSION_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_TOTAL_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_TTL_SECONDS = 2 * 60 * 60
+
+
+def estimate_size(value):
+    # Approximate in-memory size of a stored value in bytes. pandas and NumPy
+    # are looked up in sys.modules rather than imported: a value can only be
+    # a DataFrame or an array once they are loaded, and the store stays
+    # cheap to import for pages that never use them
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class _Session:
+    def __init__(self):
+        self.values = OrderedDict()  # key -> (value, size), in write order
+        self.size = 0
+        self.last_access = time.time()
+
+
+class SessionStore:
+    def __init__(self, max_session_bytes=DEFAULT_MAX_SESSION_BYTES, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES,
+                 max_sessions=DEFAULT_MAX_SESSIONS, ttl_seconds=DEFAULT_TTL_SECONDS, spill_dir=None):
+        self.max_session_bytes = max_session_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._sessions = OrderedDict()  # session_id -> _Session, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    # -- public API -----------------------------------------------------------
+
+    def get(self, session_id, key, default=None):
+        with self._lock:
+            session = self._touch(session_id)
+            entry = session.values.get(key)
+            return default if entry is None else entry[0]
+
+    def set(self, session_id, key, value):
+        size = estimate_size(value)
+        if size > self.max_session_bytes:
+            raise ValueError(f"Value for {key!r} ({size} bytes) exceeds the per-session cap of {self.max_session_bytes} bytes")
+        with self._lock:
+            session = self._touch(session_id)
+            self._discard(session, key)
+            session.values[key] = (value, size)
+            session.size += size
+            self._total_bytes += size
+            # Enforce the per-session cap by dropping the oldest writes
+            while session.size > self.max_session_bytes:
+                self._discard(session, next(iter(session.values)))
+            self._enforce_limits(keep=session_id)
+
+    def items(self, session_id):
+        with self._lock:
+            session = self._touch(session_id)
+            return {key: value for key, (value, _) in session.values.items()}
+
+    def drop_session(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.size
+            self._remove_spill(session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # -- internals ------------------------------------------------------------
+
+    def _touch(self, session_id):
+        # Return the session, restoring it from disk or creating it, and mark
+        # it as most recently used
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._restore(session_id) or _Session()
+            self._sessions[session_id] = session
+            self._total_bytes += session.size
+            self._enforce_limits(keep=session_id)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_access = time.time()
+        return session
+
+    def _discard(self, session, key):
+        entry = session.values.pop(key, None)
+        if entry is not None:
+            session.size -= entry[1]
+            self._total_bytes -= entry[1]
+
+    def _expire_idle(self):
+        # Sessions are kept in LRU order, so expired ones are at the front
+        deadline = time.time() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_access >= deadline:
+                break
+            self.drop_session(session_id)
+
+    def _enforce_limits(self, keep):
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or self._total_bytes > self.max_total_bytes):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            session = self._sessions.pop(session_id)
+            self._total_bytes -= session.size
+            self._spill(session_id, session)
+
+    def _spill_path(self, session_id):
+        return os.path.join(self.spill_dir, hashlib.sha256(str(session_id).encode()).hexdigest() + ".pkl")
+
+    def _spill(self, session_id, session):
+        if not self.spill_dir or not session.values:
+            return
+        with open(self._spill_path(session_id), "wb") as f:
+            pickle.dump((session.last_access, dict(session.values)), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _restore(self, session_id):
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(session_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            last_access, values = pickle.load(f)
+        os.remove(path)
+        if last_access < time.time() - self.ttl_seconds:
+            return None
+        session = _Session()
+        session.values.update(values)
+        session.size = sum(size for _, size in values.values())
+        return session
+
+    def _remove_spill(self, session_id):
+        if self.spill_dir:
+            path = self._spill_path(session_id)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Process-wide store shared by all sessions of the Streamlit server; limits
+# can be tuned through environment variables
+session_store = SessionStore(
+    max_session_bytes=_env_int("ESG_SESSION_MAX_BYTES", DEFAULT_MAX_SESSION_BYTES),
+    max_total_bytes=_env_int("ESG_SESSION_MAX_TOTAL_BYTES", DEFAULT_MAX_TOTAL_BYTES),
+    max_sessions=_env_int("ESG_SESSION_MAX_SESSIONS", DEFAULT_MAX_SESSIONS),
+    ttl_seconds=_env_int("ESG_SESSION_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+    spill_dir=os.environ.get("ESG_SESSION_SPILL_DIR") or None,
+)
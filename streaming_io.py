@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# Shared helpers for the out-of-core ingestion of large input files
+# (holdings and premium extracts). Files are read in fixed-size chunks (CSV)
+# or record batches (Parquet, needs pyarrow), text columns are mapped to
+# integer positions through their distinct values, and exposure shares are
+# turned into the Low/Medium/High bands of the questionnaire legend.
+
+CHUNK_SIZE = 1_000_000
+
+# Exposure share thresholds: Low < 10% <= Medium <= 30% < High
+LOW_THRESHOLD = 0.10
+HIGH_THRESHOLD = 0.30
+
+
+def exposure_bands(shares, not_relevant_label="Not relevant/No Exposure"):
+    # Map exposure shares to Low/Medium/High; zero (or negative) shares are not relevant
+    shares = np.asarray(shares, dtype=np.float64)
+    bands = np.select(
+        [shares <= 0, shares < LOW_THRESHOLD, shares <= HIGH_THRESHOLD],
+        [not_relevant_label, "Low", "Medium"],
+        default="High",
+    )
+    return bands.astype(object)
+
+
+def build_index(names_per_position):
+    # {name: position} for case-insensitive lookups; every position may be
+    # known under several names (e.g. full name and short name)
+    index = {}
+    for position, names in enumerate(names_per_position):
+        for name in names:
+            index[str(name).strip().casefold()] = position
+    return index
+
+
+def lookup_codes(values, index, default):
+    # Map a chunk column to integer positions through its (small) set of
+    # distinct values instead of row by row; unknown values get default
+    categorical = pd.Categorical(values)
+    lookup = np.array([index.get(str(c).strip().casefold(), default) for c in categorical.categories] + [default], dtype=np.intp)
+    return lookup[categorical.codes]
+
+
+def iter_chunks(source, columns, chunk_size=CHUNK_SIZE, category_columns=(), file_name=None):
+    # Yield DataFrame chunks of the given columns (those present in the file)
+    # from a CSV or Parquet path or file-like object
+    name = file_name or (source if isinstance(source, str) else getattr(source, "name", ""))
+    if str(name).lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)") from exc
+        parquet = pq.ParquetFile(source)
+        available = [c for c in columns if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=available):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            source, usecols=lambda c: c in columns, chunksize=chunk_size,
+            dtype={column: "category" for column in category_columns},
+        )
@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_assessment import CONSOLIDATED_FILE, build_line_table, encode_exposure_matrix, entity_file_names, read_exposures, run_batch
+from materiality_engine import HIGH, LOW, MEDIUM, NOT_RELEVANT
+
+
+def exposures(text):
+    return read_exposures(io.StringIO(text))
+
+
+def test_read_exposures_requires_columns():
+    with pytest.raises(ValueError, match="missing columns: Exposure"):
+        exposures("Entity,Line\nA,MED\n")
+
+
+def test_encode_exposure_matrix_accepts_full_and_short_names():
+    lines = build_line_table()
+    entities, codes, given = encode_exposure_matrix(exposures(
+        "Entity,Line,Exposure\n"
+        "A,MED,Medium\n"
+        "A,Equity, High \n"
+        "B,Fire and other damage to property insurance,Low\n"
+        "B,WC,Not relevant/No exposure\n"
+    ), lines)
+    position = {line: row for row, line in enumerate(lines["Short Name"])}
+    assert entities == ["A", "B"]
+    assert codes.shape == given.shape == (2, len(lines))
+    assert codes[0, position["MED"]] == MEDIUM and codes[0, position["EQUTY"]] == HIGH
+    assert codes[1, position["FIRE"]] == LOW and codes[1, position["WC"]] == NOT_RELEVANT
+    assert given.sum(axis=1).tolist() == [2, 2]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("Entity,Line,Exposure\nA,MED,Low\n,WC,Low\n", "Blank Entity in rows 3"),
+    ("Entity,Line,Exposure\nA,MED,Low\nA, ,Low\nB,,High\n", "Blank Line in rows 3, 4"),
+    ("Entity,Line,Exposure\nA,MED,Low\nA,Crypto,Low\n", "Unknown lines of business / asset classes: Crypto"),
+    ("Entity,Line,Exposure\nA,MED,medium\nA,WC,Hgh\n", "Unknown exposure labels: medium, Hgh"),
+])
+def test_encode_exposure_matrix_rejects_invalid_rows(text, message):
+    with pytest.raises(ValueError, match=message):
+        encode_exposure_matrix(exposures(text), build_line_table())
+
+
+def test_entity_file_names_are_unique_and_order_independent():
+    entities = ["Sub A", "Sub/A", "sub a", "Sub B", "consolidated"]
+    names = entity_file_names(entities, reserved=[CONSOLIDATED_FILE])
+    assert len({name.lower() for name in names}) == len(names)
+    assert names[3] == "Sub_B"
+    assert CONSOLIDATED_FILE not in names
+    assert entity_file_names(entities[::-1], reserved=[CONSOLIDATED_FILE])[::-1] == names
+
+
+def test_run_batch_writes_entity_and_consolidated_tables(tmp_path):
+    input_path = tmp_path / "exposures.csv"
+    input_path.write_text(
+        "Entity,Line,Exposure\n"
+        "A,MED,Medium\n"
+        "A,EQUTY,High\n"
+        "consolidated,FIRE,Low\n"
+    )
+    output_dir = tmp_path / "results"
+    consolidated = run_batch(str(input_path), str(output_dir), workers=1)
+
+    assert len(consolidated) == 3
+    written = pd.read_csv(output_dir / f"{CONSOLIDATED_FILE}.csv")
+    assert written["Entity"].tolist() == ["A", "A", "consolidated"]
+    np.testing.assert_array_equal(written["Physical Risk Result"], [2.0, 3.0, 2.0])
+    np.testing.assert_array_equal(written["Transitional Risk Result"], [1.5, 3.0, 2.0])
+
+    # The entity named "consolidated" must not overwrite the consolidated table
+    files = sorted(path.name for path in output_dir.iterdir())
+    assert len(files) == 3
+    assert "A.csv" in files and f"{CONSOLIDATED_FILE}.csv" in files
+    assert pd.read_csv(output_dir / "A.csv")["Short Name"].tolist() == ["MED", "EQUTY"]
@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pytest
+
+from batch_assessment import read_exposures
+from group_consolidation import GroupConsolidation
+from materiality_engine import HIGH, LOW, MEDIUM, NOT_RELEVANT
+
+
+def group(text):
+    return GroupConsolidation.from_exposures(read_exposures(io.StringIO(text)))
+
+
+def line_result(results, short_name):
+    return results[results["Short Name"] == short_name].iloc[0]
+
+
+def test_group_results_are_volume_weighted_over_relevant_entities():
+    results = group(
+        "Entity,Line,Exposure,Volume\n"
+        "A,MED,Low,700\n"
+        "B,MED,High,100\n"
+        "C,MED,Not relevant/No exposure,600\n"
+    ).group_results()
+    med = line_result(results, "MED")
+    # MED: physical factor 2, transition factor 1; C is not relevant
+    assert med["Entities"] == 2
+    assert med["Volume"] == 800
+    assert med["Physical Risk Result"] == pytest.approx((700 * 1.5 + 100 * 2.5) / 800)
+    assert med["Transitional Risk Result"] == pytest.approx((700 * 1.0 + 100 * 2.0) / 800)
+    assert med["Exposure Materiality"] == "Low"
+    assert line_result(results, "WC")["Entities"] == 0
+    assert line_result(results, "WC")["Exposure Materiality"] == "Not relevant/No exposure"
+
+
+def test_group_results_without_volumes_weigh_entities_equally():
+    consolidation = group("Entity,Line,Exposure\nA,MED,Low\nB,MED,High\n")
+    results = consolidation.group_results("Insurance")
+    assert not consolidation.weighted
+    assert "Volume" not in results.columns
+    assert set(results["Activity"]) == {"Insurance"}
+    assert line_result(results, "MED")["Physical Risk Result"] == pytest.approx(2.0)
+    assert line_result(results, "MED")["Exposure Materiality"] == "Medium"
+
+
+def test_zero_volumes_fall_back_to_equal_weights():
+    results = group("Entity,Line,Exposure,Volume\nA,MED,Low,0\nB,MED,High,0\n").group_results()
+    assert line_result(results, "MED")["Physical Risk Result"] == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("volume", ["", "n/a", "-5"])
+def test_invalid_volumes_are_rejected(volume):
+    with pytest.raises(ValueError, match="Volume in rows 3"):
+        group(f"Entity,Line,Exposure,Volume\nA,MED,Low,10\nB,MED,High,{volume}\n")
+
+
+def test_incremental_updates_match_full_recompute():
+    rng = np.random.default_rng(0)
+    consolidation = group("Entity,Line,Exposure,Volume\nA,MED,Low,10\nB,EQUTY,High,5\n")
+    n_lines = len(consolidation.lines)
+    levels = np.array([NOT_RELEVANT, LOW, MEDIUM, HIGH], dtype=np.int8)
+    for step in range(50):
+        entity = f"E{rng.integers(0, 8)}"
+        volumes = rng.integers(0, 3, n_lines) * rng.uniform(0.0, 1e6, n_lines)
+        consolidation.update_entity(entity, rng.choice(levels, n_lines), volumes)
+    incremental = consolidation.group_results()
+    consolidation.recompute()
+    recomputed = consolidation.group_results()
+
+    assert incremental["Entities"].tolist() == recomputed["Entities"].tolist()
+    assert incremental["Exposure Materiality"].tolist() == recomputed["Exposure Materiality"].tolist()
+    for column in ("Volume", "Physical Risk Result", "Transitional Risk Result"):
+        np.testing.assert_allclose(incremental[column], recomputed[column], rtol=1e-9, atol=1e-6)
+
+
+def test_drill_downs():
+    consolidation = group("Entity,Line,Exposure,Volume\nA,MED,Low,300\nB,MED,High,100\nB,EQUTY,Medium,50\n")
+    contributions = consolidation.line_contributions("Medical expenses")
+    assert contributions["Entity"].tolist() == ["A", "B"]
+    assert contributions["Weight"].tolist() == pytest.approx([0.75, 0.25])
+
+    entity = consolidation.entity_results("B")
+    assert len(entity) == len(consolidation.lines)
+    assert line_result(entity, "EQUTY")["Volume"] == 50
+    assert line_result(entity, "EQUTY")["Physical Risk Result"] == pytest.approx(2.5)
+    assert np.isnan(line_result(entity, "WC")["Physical Risk Result"])
@@ -0,0 +1,42 @@
+import numpy as np
+
+from materiality_engine import HIGH, LOW, MEDIUM, NOT_RELEVANT, decode_exposure, encode_exposure, score_materiality, unknown_exposure_labels
+
+
+def test_encode_exposure_maps_bands_and_everything_else_to_not_relevant():
+    codes = encode_exposure(["Low", "Medium", "High", "Not relevant/No exposure", None, "medium"])
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [LOW, MEDIUM, HIGH, NOT_RELEVANT, NOT_RELEVANT, NOT_RELEVANT]
+
+
+def test_decode_exposure_inverts_encode_exposure():
+    labels = ["High", "Not relevant/No Exposure", "Low", "Medium"]
+    assert decode_exposure(encode_exposure(labels), not_relevant_label="Not relevant/No Exposure").tolist() == labels
+
+
+def test_unknown_exposure_labels_skips_blanks_and_not_relevant_variants():
+    labels = ["Low", "medium", "", None, np.nan, "Not relevant", "NOT RELEVANT/No exposure", "Hgh", "medium"]
+    assert unknown_exposure_labels(labels) == ["medium", "Hgh"]
+    assert unknown_exposure_labels(np.array([["Low", "High"], ["Medium", ""]], dtype=object)) == []
+
+
+def test_unknown_exposure_labels_handles_unhashable_labels():
+    labels = np.empty(2, dtype=object)
+    labels[:] = [["Low"], "High"]
+    assert unknown_exposure_labels(labels) == [["Low"]]
+
+
+def test_score_materiality_averages_exposure_and_factor():
+    physical, transitional = score_materiality(encode_exposure(["Low", "High", "Not relevant/No exposure"]), [2, 3, 1], [1, 1, 3])
+    np.testing.assert_array_equal(physical, [1.5, 3.0, np.nan])
+    np.testing.assert_array_equal(transitional, [1.0, 2.0, np.nan])
+
+
+def test_score_materiality_broadcasts_over_entities():
+    codes = np.array([[LOW, MEDIUM], [HIGH, NOT_RELEVANT]], dtype=np.int8)
+    physical, transitional = score_materiality(codes, np.array([1.0, 3.0]), np.array([2.0, 2.0]))
+    assert physical.shape == transitional.shape == (2, 2)
+    for row in range(2):
+        single = score_materiality(codes[row], [1.0, 3.0], [2.0, 2.0])
+        np.testing.assert_array_equal(physical[row], single[0])
+        np.testing.assert_array_equal(transitional[row], single[1])
@@ -0,0 +1,54 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from scoring_service import HttpError, ResponseCache, ScoringService
+
+
+@pytest.fixture(scope="module")
+def service():
+    return ScoringService()
+
+
+def score(service, exposures):
+    status, body = service.handle("POST", "/score/lob", json.dumps({"exposures": exposures}).encode())
+    assert status == HTTPStatus.OK
+    return json.loads(body)
+
+
+def test_score_accepts_vectors_and_objects(service):
+    table = service.tables["lob"]
+    vector = ["Not relevant/No exposure"] * len(table)
+    vector[0] = "High"
+    result = score(service, [vector, {"med": "High"}])
+    assert result["short_names"][0] == "MED"
+    assert result["physical"][0][0] == result["physical"][1][0] == 2.5
+    assert result["physical"][0][1] is None
+
+
+@pytest.mark.parametrize("exposures, message", [
+    ([{"MED": "high"}], "Unknown exposure labels"),
+    ([{"Crypto": "High"}], "Unknown line"),
+    ([["Low"]], "entries, expected"),
+])
+def test_invalid_requests_are_rejected(service, exposures, message):
+    with pytest.raises(HttpError) as info:
+        service.handle("POST", "/score/lob", json.dumps({"exposures": exposures}).encode())
+    assert info.value.status == HTTPStatus.BAD_REQUEST
+    assert message in str(info.value)
+
+
+def test_response_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_bytes=250, max_entries=10, max_item_bytes=200)
+    cache.put("a", b"x" * 100, alias="alias")
+    cache.put("b", b"x" * 100)
+    cache.put("too big", b"x" * 201)
+    assert cache.get("too big") is None
+    # Reading "a" through its alias makes "b" the least recently used entry
+    assert cache.get("alias") == b"x" * 100
+    cache.put("c", b"x" * 100)
+    assert cache.size_bytes == 200
+    assert cache.get("b") is None
+    cache.put("d", b"x" * 100)
+    assert cache.get("a") is None and cache.get("alias") is None
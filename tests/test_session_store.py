@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from session_store import SessionStore, estimate_size
+
+VALUE = b"x" * 1000
+VALUE_SIZE = estimate_size(VALUE)
+
+
+def test_values_are_kept_per_session():
+    store = SessionStore()
+    store.set("s1", "key", 1)
+    store.set("s2", "key", 2)
+    assert store.get("s1", "key") == 1
+    assert store.get("s2", "key") == 2
+    assert store.get("s1", "missing", "default") == "default"
+    assert store.items("s1") == {"key": 1}
+
+
+def test_session_cap_drops_the_oldest_writes():
+    store = SessionStore(max_session_bytes=3 * VALUE_SIZE)
+    for key in "abcd":
+        store.set("s", key, VALUE)
+    assert list(store.items("s")) == ["b", "c", "d"]
+    # Rewriting a key makes it the most recent write
+    store.set("s", "b", VALUE)
+    store.set("s", "e", VALUE)
+    assert list(store.items("s")) == ["d", "b", "e"]
+
+
+def test_value_above_the_session_cap_is_rejected():
+    store = SessionStore(max_session_bytes=VALUE_SIZE - 1)
+    store.set("s", "small", 1)
+    with pytest.raises(ValueError, match="exceeds the per-session cap"):
+        store.set("s", "big", VALUE)
+    assert store.items("s") == {"small": 1}
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = SessionStore(max_sessions=2)
+    store.set("s1", "key", 1)
+    store.set("s2", "key", 2)
+    store.get("s1", "key")
+    store.set("s3", "key", 3)
+    assert len(store) == 2
+    assert store.get("s1", "key") == 1
+    assert store.get("s2", "key") is None
+
+
+def test_total_bytes_bound_evicts_other_sessions():
+    store = SessionStore(max_total_bytes=2 * VALUE_SIZE)
+    for session_id in ("s1", "s2", "s3"):
+        store.set(session_id, "key", VALUE)
+    assert store.get("s1", "key") is None
+    assert store.get("s3", "key") == VALUE
+
+
+def test_idle_sessions_expire(monkeypatch):
+    store = SessionStore(ttl_seconds=60)
+    store.set("s", "key", 1)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert store.get("s", "key") is None
+
+
+def test_evicted_sessions_are_spilled_and_restored(tmp_path):
+    store = SessionStore(max_sessions=1, spill_dir=str(tmp_path))
+    store.set("s1", "key", {"answer": 42})
+    store.set("s2", "key", 2)
+    assert len(store) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    assert store.get("s1", "key") == {"answer": 42}
+    store.drop_session("s2")
+    assert list(tmp_path.iterdir()) == []